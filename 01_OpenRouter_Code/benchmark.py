@@ -0,0 +1,131 @@
+"""
+Benchmark: blocking `requests.post` (like OpenRouter_API_directly.py) vs the async pooled client.
+It starts a small local mock of the OpenRouter API, so no API key or internet is needed.
+
+    python benchmark.py --requests 200 --latency 0.05 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from openrouter_async import OpenRouterClient
+
+
+class MockOpenRouter(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    latency = 0.05
+
+    def log_message(self, *args):
+        pass  # keep the benchmark output clean
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.latency)  # pretend the model is thinking
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for word in ["The ", "meaning ", "is ", "42."]:
+                event = {"choices": [{"delta": {"content": word}}]}
+                self._chunk(f"data: {json.dumps(event)}\n\n")
+            self._chunk("data: [DONE]\n\n")
+            self._chunk("")
+            return
+
+        payload = json.dumps({
+            "model": body["model"],
+            "choices": [{"message": {"role": "assistant", "content": "The meaning is 42."}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+
+
+class MockServer(ThreadingHTTPServer):
+    request_queue_size = 256  # the default backlog of 5 drops concurrent connects
+    daemon_threads = True
+
+
+def _serve(latency: float, port_queue) -> None:
+    MockOpenRouter.latency = latency
+    server = MockServer(("127.0.0.1", 0), MockOpenRouter)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_server(latency: float):
+    # Separate process, so the mock server does not fight the benchmark for the GIL
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(latency, port_queue), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get()}"
+
+
+def run_blocking(base_url: str, n: int) -> float:
+    # Same call style as OpenRouter_API_directly.py: one requests.post per prompt, one after another
+    start = time.perf_counter()
+    for i in range(n):
+        response = requests.post(
+            url=f"{base_url}/chat/completions",
+            headers={"Authorization": "Bearer test"},
+            data=json.dumps({
+                "model": "mock",
+                "messages": [{"role": "user", "content": f"Question {i}"}],
+            }),
+        )
+        response.json()["choices"][0]["message"]["content"]
+    return time.perf_counter() - start
+
+
+async def run_async(base_url: str, n: int, concurrency: int) -> float:
+    async with OpenRouterClient(api_key="test", base_url=base_url, model="mock",
+                                max_connections=concurrency) as client:
+        start = time.perf_counter()
+        results = await client.batch([f"Question {i}" for i in range(n)], concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+
+        # Sanity check for the SSE path
+        text = "".join([token async for token in client.stream("stream check")])
+        assert text == "The meaning is 42.", text
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server delay (seconds)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.latency)
+
+    blocking = run_blocking(base_url, args.requests)
+    pooled = asyncio.run(run_async(base_url, args.requests, args.concurrency))
+    server.terminate()
+
+    print(f"{'client':<28}{'time (s)':>10}{'req/s':>10}")
+    print(f"{'requests.post (blocking)':<28}{blocking:>10.2f}{args.requests / blocking:>10.1f}")
+    print(f"{'OpenRouterClient.batch':<28}{pooled:>10.2f}{args.requests / pooled:>10.1f}")
+    print(f"speedup: {blocking / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Async OpenRouter Client
+-----------------------
+Non-blocking replacement for the `requests.post(...)` call in OpenRouter_API_directly.py.
+
+- One pooled httpx.AsyncClient is reused for every request (keep-alive connections).
+- `stream()` reads the Server-Sent Events (SSE) response with an incremental parser,
+  so tokens are yielded as soon as they arrive.
+- `batch()` sends many prompts at once, but never more than `concurrency` at a time.
+
+Reference: https://openrouter.ai/docs/api-reference/streaming
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_URL = "https://openrouter.ai/api/v1"
+MODEL = "google/gemini-2.0-flash-lite-preview-02-05:free"
+
+Messages = Union[str, List[Dict[str, Any]]]
+
+
+class SSEParser:
+    """
+    Incremental Server-Sent Events parser.
+
+    Feed it text chunks in any size (a chunk may hold half a line or many events)
+    and it returns the `data:` payloads of every event that is complete so far.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._data: List[str] = []
+
+    def feed(self, chunk: str) -> List[str]:
+        self._buffer += chunk
+        events = []
+        while True:
+            newline = self._buffer.find("\n")
+            if newline == -1:
+                break
+            line = self._buffer[:newline].rstrip("\r")
+            self._buffer = self._buffer[newline + 1:]
+
+            if line == "":
+                # A blank line ends the current event
+                if self._data:
+                    events.append("\n".join(self._data))
+                    self._data = []
+            elif line.startswith(":"):
+                # Comment line, e.g. ": OPENROUTER PROCESSING"
+                continue
+            elif line.startswith("data:"):
+                self._data.append(line[5:].lstrip(" "))
+        return events
+
+
+def _to_messages(prompt: Messages) -> List[Dict[str, Any]]:
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return prompt
+
+
+class OpenRouterClient:
+    """Async chat-completions client for OpenRouter that shares one connection pool."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = BASE_URL,
+        model: str = MODEL,
+        max_connections: int = 20,
+        timeout: float = 60.0,
+    ) -> None:
+        self.model = model
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key or os.getenv('OPENROUTER_API_KEY')}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+        )
+
+    async def __aenter__(self) -> "OpenRouterClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _payload(self, prompt: Messages, stream: bool, **params: Any) -> Dict[str, Any]:
+        return {"model": self.model, "messages": _to_messages(prompt), "stream": stream, **params}
+
+    async def complete(self, prompt: Messages, **params: Any) -> Dict[str, Any]:
+        """
+        Send one chat-completion request and return the JSON response.
+
+        Args:
+            prompt (str | list): A user message, or a full list of chat messages.
+            **params: Extra body fields such as temperature or max_tokens.
+        """
+        response = await self._client.post(
+            "/chat/completions", json=self._payload(prompt, stream=False, **params)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def stream(self, prompt: Messages, **params: Any) -> AsyncIterator[str]:
+        """Yield the assistant's text deltas as they arrive over SSE."""
+        parser = SSEParser()
+        async with self._client.stream(
+            "POST", "/chat/completions", json=self._payload(prompt, stream=True, **params)
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                for data in parser.feed(chunk):
+                    if data == "[DONE]":
+                        return
+                    event = json.loads(data)
+                    if "error" in event:
+                        raise RuntimeError(event["error"])
+                    for choice in event.get("choices", []):
+                        delta = choice.get("delta", {}).get("content")
+                        if delta:
+                            yield delta
+
+    async def batch(
+        self,
+        prompts: Iterable[Messages],
+        concurrency: int = 8,
+        **params: Any,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Run many prompts concurrently, at most `concurrency` in flight.
+
+        Returns:
+            list: One response per prompt, in input order. Failed prompts hold the exception.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(prompt: Messages) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.complete(prompt, **params)
+
+        return await asyncio.gather(*(_one(p) for p in prompts), return_exceptions=True)
+
+
+async def main():
+    async with OpenRouterClient() as client:
+        # 1. Streaming answer
+        async for token in client.stream("What is the meaning of life?"):
+            print(token, end="", flush=True)
+        print()
+
+        # 2. Many prompts at once
+        results = await client.batch([f"Say hello number {i}" for i in range(5)], concurrency=3)
+        for result in results:
+            if isinstance(result, Exception):
+                print("Error:", result)
+            else:
+                print(result["choices"][0]["message"]["content"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
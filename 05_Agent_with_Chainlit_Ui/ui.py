@@ -4,11 +4,15 @@ import chainlit as cl
 from main import stream_events
 import asyncio
 from agents import Runner 
+from coalesce import CoalescedStream
+from filtered_stream import StreamFilter
 
 
 @cl.on_chat_start
 async def on_chat_start():
     cl.user_session.set("history",[])
+    # One filter per chat, so its delivered / suppressed counts belong to this session
+    cl.user_session.set("text_only", StreamFilter(events={"raw_response_event"}, raw={"response.output_text.delta"}))
     await cl.Message("I am Mustafa Agent . How can i Assist you today :)").send()
     
 @cl.on_message
@@ -24,7 +28,10 @@ async def main(message: cl.Message):
         starting_agent=asyncio.run(stream_events()),
         input=history,
     )
-    async for event in response.stream_events():
+    # This UI only shows text: other events are never queued for it
+    cl.user_session.get("text_only").attach(response)
+    # Deltas are sent in chunks (every 30 ms / 256 bytes), not one websocket frame per token
+    async for event in CoalescedStream(response).stream_events():
             if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
                 token = event.data.delta
                 await Aimsg.stream_token(token)
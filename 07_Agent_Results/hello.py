@@ -1,6 +1,11 @@
 from agents import Agent, Runner, GuardrailFunctionOutput, InputGuardrail
 from pydantic import BaseModel
 import asyncio
+from semantic_cache import SemanticVerdictCache, cached_guardrail
+from speculative_runner import SpeculativeRunner
+
+# Starts the main agent while the guardrail agent is still checking the input
+speculative_runner = SpeculativeRunner()
 
 # Pydantic model for guardrail output
 class ValidQueryOutput(BaseModel):
@@ -14,7 +19,11 @@ guardrail_agent = Agent(
     output_type=ValidQueryOutput
 )
 
+# Similar questions ("capital of Brazil?", "what's the capital of brazil") share one verdict
+geography_cache = SemanticVerdictCache(threshold=0.85)
+
 # Guardrail function
+@cached_guardrail(geography_cache)
 async def geography_guardrail(ctx, agent, input_data):
     result = await Runner.run(guardrail_agent, input_data, context=ctx.context)
     final_output = result.final_output_as(ValidQueryOutput)
@@ -46,7 +55,7 @@ async def main():
     try:
         # Run the main agent with an input
         input_query = "What is the capital of Brazil?"
-        result = await Runner.run(main_agent, input_query)
+        result = await speculative_runner.run(main_agent, input_query)
 
         # Exploring RunResultBase components
         print("=== RunResultBase Components ===")
@@ -0,0 +1,217 @@
+"""
+Bounded Streaming
+-----------------
+`Runner.run_streamed(...)` puts every event into an unbounded `asyncio.Queue`. When the reader of
+`result.stream_events()` is slow (a slow websocket, a blocking print loop), events pile up in
+memory for as long as the model keeps generating.
+
+`BoundedRunner` gives every streamed run a `BoundedEventQueue` of `max_events` and a policy for
+when it is full:
+
+- `"block"`: the model stream is paused until the reader catches up (real backpressure: the
+  HTTP stream from the provider is not read further).
+- `"coalesce"`: a new text delta is merged into the last queued one, so the number of events
+  stays bounded while no text is lost.
+- `"drop"`: raw `*.delta` events are dropped. Item events (`run_item_stream_event`) are kept, so
+  the complete message and tool calls still arrive.
+
+Item events, agent updates and the end-of-run marker are never dropped or delayed, so the queue
+may go a few events over `max_events`. `stats()` reports queue depth, stall time and overflow.
+
+The runner replaces private SDK internals: the run's `RunResultStreaming._event_queue` and the
+`AgentRunner._get_model` hook. Tested with openai-agents 0.1.0 to 0.2.9; `BoundedRunner()` raises
+if the installed SDK does not have them, instead of silently streaming unbounded.
+"""
+
+import asyncio
+import contextvars
+import dataclasses
+import time
+from dataclasses import asdict, dataclass
+from importlib.metadata import version
+from typing import Any, AsyncIterator, Dict, Optional
+
+from openai.types.responses import ResponseTextDeltaEvent
+from agents import Agent, Model, RawResponsesStreamEvent, RunConfig, RunResultStreaming
+try:
+    from agents.run import AgentRunner
+except ImportError as e:  # openai-agents < 0.1.0
+    raise ImportError("bounded_stream needs openai-agents>=0.1.0 (AgentRunner)") from e
+
+POLICIES = ("block", "coalesce", "drop")
+SUPPORTED_SDK = "openai-agents 0.1.0 to 0.2.9"
+
+# The queue of the streamed run being started; the run's task copies it from the context
+_current_queue: contextvars.ContextVar[Optional["BoundedEventQueue"]] = contextvars.ContextVar(
+    "bounded_event_queue", default=None
+)
+
+
+@dataclass
+class QueueStats:
+    puts: int = 0
+    max_depth: int = 0
+    depth_sum: int = 0
+    stalls: int = 0
+    stall_seconds: float = 0.0
+    coalesced: int = 0
+    dropped: int = 0
+
+
+def _text_delta(event: Any) -> Optional[ResponseTextDeltaEvent]:
+    if isinstance(event, RawResponsesStreamEvent) and isinstance(event.data, ResponseTextDeltaEvent):
+        return event.data
+    return None
+
+
+def _report(counters: QueueStats) -> Dict[str, Any]:
+    report: Dict[str, Any] = asdict(counters)
+    depth_sum = report.pop("depth_sum")
+    report["avg_depth"] = round(depth_sum / counters.puts, 1) if counters.puts else 0.0
+    report["stall_seconds"] = round(counters.stall_seconds, 3)
+    return report
+
+
+class BoundedEventQueue(asyncio.Queue):
+    """
+    Drop-in for `RunResultStreaming._event_queue`. `put_nowait` never raises; the policy
+    decides what happens to a raw delta when `max_events` are waiting.
+    """
+
+    def __init__(self, max_events: int = 256, policy: str = "block", totals: Optional[QueueStats] = None) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        _check_sdk()
+        super().__init__()
+        self.max_events = max_events
+        self.policy = policy
+        self.counters = QueueStats()
+        self._all = [self.counters] + ([totals] if totals is not None else [])  # totals: shared by a runner
+        self._space = asyncio.Event()
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        for counters in self._all:
+            setattr(counters, name, getattr(counters, name) + amount)
+
+    def is_full(self) -> bool:
+        return self.qsize() >= self.max_events
+
+    def put_nowait(self, item: Any) -> None:
+        if self.is_full() and isinstance(item, RawResponsesStreamEvent):
+            if self.policy == "coalesce" and self._merge(item):
+                self._count("coalesced")
+                return
+            if self.policy == "drop" and item.data.type.endswith(".delta"):
+                self._count("dropped")
+                return
+        super().put_nowait(item)
+        depth = self.qsize()
+        self._count("puts")
+        self._count("depth_sum", depth)
+        for counters in self._all:
+            counters.max_depth = max(counters.max_depth, depth)
+
+    def _merge(self, item: RawResponsesStreamEvent) -> bool:
+        new = _text_delta(item)
+        last = _text_delta(self._queue[-1]) if self._queue else None
+        if new is None or last is None or (last.item_id, last.output_index, last.content_index) != (
+            new.item_id, new.output_index, new.content_index
+        ):
+            return False
+        self._queue[-1] = RawResponsesStreamEvent(data=last.model_copy(update={"delta": last.delta + new.delta}))
+        return True
+
+    def get_nowait(self) -> Any:
+        item = super().get_nowait()
+        self._space.set()
+        return item
+
+    async def wait_for_space(self) -> None:
+        """Used by the producer under the "block" policy."""
+        if not self.is_full():
+            return
+        self._count("stalls")
+        start = time.perf_counter()
+        try:
+            while self.is_full():
+                self._space.clear()
+                await self._space.wait()
+        finally:
+            self._count("stall_seconds", time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(_report(self.counters), depth=self.qsize())
+
+
+class BackpressureModel(Model):
+    """Reads the next event from the model only when the run's queue has space."""
+
+    def __init__(self, model: Model, queue: BoundedEventQueue) -> None:
+        self.model = model
+        self.queue = queue
+
+    async def get_response(self, *args: Any, **kwargs: Any):
+        return await self.model.get_response(*args, **kwargs)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async for event in self.model.stream_response(*args, **kwargs):
+            await self.queue.wait_for_space()
+            yield event
+
+
+def _check_sdk() -> None:
+    """Fail loudly when the SDK internals this module replaces are gone or renamed."""
+    missing = []
+    if not callable(getattr(AgentRunner, "_get_model", None)):
+        missing.append("AgentRunner._get_model")
+    if "_event_queue" not in {f.name for f in dataclasses.fields(RunResultStreaming)}:
+        missing.append("RunResultStreaming._event_queue")
+    if missing:
+        raise RuntimeError(
+            f"BoundedRunner needs {', '.join(missing)}, which openai-agents {version('openai-agents')} "
+            f"does not have (tested with {SUPPORTED_SDK})"
+        )
+
+
+class BoundedRunner(AgentRunner):
+    """
+    Args:
+        max_events (int): Events a streamed run may queue for its reader.
+        policy (str): "block", "coalesce" or "drop" (see the module docstring).
+
+    Use with `set_default_agent_runner(BoundedRunner(...))`; `Runner.run` is unchanged.
+    """
+
+    def __init__(self, max_events: int = 256, policy: str = "block") -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        _check_sdk()
+        super().__init__()
+        self.max_events = max_events
+        self.policy = policy
+        self.runs = 0
+        self.totals = QueueStats()
+
+    def run_streamed(self, starting_agent: Agent, input: Any, **kwargs: Any) -> RunResultStreaming:
+        queue = BoundedEventQueue(self.max_events, self.policy, totals=self.totals)
+        token = _current_queue.set(queue)
+        try:
+            result = super().run_streamed(starting_agent, input, **kwargs)
+        finally:
+            _current_queue.reset(token)
+        # The run's task has not started yet, so no event went to the old queue
+        result._event_queue = queue
+        self.runs += 1
+        return result
+
+    @classmethod
+    def _get_model(cls, agent: Agent, run_config: RunConfig) -> Model:
+        model = super()._get_model(agent, run_config)
+        queue = _current_queue.get()
+        if queue is not None and queue.policy == "block":
+            return BackpressureModel(model, queue)
+        return model
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals over all streamed runs; `result._event_queue.stats()` has one run's numbers."""
+        return dict(_report(self.totals), runs=self.runs)
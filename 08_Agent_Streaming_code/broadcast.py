@@ -0,0 +1,128 @@
+"""
+Broadcast Streaming
+-------------------
+`result.stream_events()` has a single reader: every event is taken out of the queue once. To
+show one run in several places (the Chainlit message, an audit log, a metrics tap) each would
+need its own run.
+
+`Broadcast` reads the run once and shares its events with any number of subscribers:
+
+- Every event gets a sequence number and goes into a replay buffer of the last `replay` events.
+- A subscriber can join at any time, even after the run ended. It first gets the buffered
+  events (or only those after `after=`, for a reconnecting tab), then the live ones.
+- Subscribers only keep a position in the shared buffer, so a slow subscriber uses no memory
+  and never holds back the others. If it falls out of the buffer, it skips ahead to the
+  oldest event still there and its `missed` count goes up.
+- An error of the run is raised in every subscriber, after the events before it.
+
+A `Subscription` works where a `RunResultStreaming` is expected: it has `stream_events()` and
+passes other attributes (`final_output`, `cancel()`, ...) on to the run.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Optional, Tuple
+
+from agents import RunResultStreaming
+
+
+class Broadcast:
+    """
+    Args:
+        result (RunResultStreaming): From `Runner.run_streamed(...)`. Create the Broadcast inside
+            the event loop; it starts reading the run at once.
+        replay (int): Events kept for late and slow subscribers.
+    """
+
+    def __init__(self, result: RunResultStreaming, replay: int = 1024) -> None:
+        self.result = result
+        self.replay = replay
+        self.subscribers = 0
+        self._buffer: Deque[Tuple[int, Any]] = deque(maxlen=replay)
+        self._next_seq = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+        self._pump = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        # One task owns the run's stream from start to end (the SDK's tracing needs that)
+        try:
+            async for event in self.result.stream_events():
+                self._buffer.append((self._next_seq, event))
+                self._next_seq += 1
+                self._notify()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    @property
+    def oldest(self) -> int:
+        """Sequence number of the oldest event still in the buffer."""
+        return self._buffer[0][0] if self._buffer else self._next_seq
+
+    def subscribe(self, after: Optional[int] = None) -> "Subscription":
+        """
+        A new reader. By default it starts with the oldest buffered event; `after=seq` resumes
+        after an event it has seen (e.g. `subscription.seq` before a reconnect).
+        """
+        self.subscribers += 1
+        return Subscription(self, 0 if after is None else after + 1)
+
+    async def wait(self) -> None:
+        """Wait until the run has been read to the end."""
+        await asyncio.shield(self._pump)
+
+    def cancel(self) -> None:
+        self.result.cancel()
+        self._pump.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "events": self._next_seq,
+            "buffered": len(self._buffer),
+            "subscribers": self.subscribers,
+            "done": self._done,
+        }
+
+
+class Subscription:
+    """One reader of a `Broadcast`. `seq` is the sequence number of the last event it got."""
+
+    def __init__(self, broadcast: Broadcast, start: int) -> None:
+        self._broadcast = broadcast
+        self._next = start
+        self.seq: Optional[int] = None
+        self.received = 0
+        self.missed = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._broadcast.result, name)  # final_output, new_items, cancel, ...
+
+    async def stream_events(self) -> AsyncIterator[Any]:
+        b = self._broadcast
+        while True:
+            if self._next < b.oldest:  # too slow (or joined late): the events in between are gone
+                self.missed += b.oldest - self._next
+                self._next = b.oldest
+            if self._next < b._next_seq:
+                seq, event = b._buffer[self._next - b.oldest]
+                self._next = seq + 1
+                self.seq = seq
+                self.received += 1
+                yield event
+                continue
+            if b._done:
+                if b._error is not None:
+                    raise b._error
+                return
+            await b._changed.wait()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self.stream_events()
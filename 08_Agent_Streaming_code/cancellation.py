@@ -0,0 +1,172 @@
+"""
+Cancelling Streamed Runs
+------------------------
+When the user closes the tab mid-answer, `Runner.run_streamed` keeps going: the model keeps
+generating, tools keep running, and every token is paid for.
+
+`CancellableRun` wraps a `RunResultStreaming` with a `cancel(reason)` that:
+
+- cancels the run's task. The `CancelledError` closes the model's HTTP stream and reaches the
+  tool calls in flight, including sub-agent runs started by `Agent.as_tool(...)` tools,
+- cancels the guardrail tasks,
+- wakes up the reader of `stream_events()` (the SDK's own `cancel()` leaves it waiting),
+- returns a `CancelReport`: time and tokens spent so far, tools interrupted, and the time and
+  tokens saved, estimated from the runs of the same `CancellationTracker` that finished.
+
+UIs call it from their disconnect hook (`@cl.on_chat_end`, `@cl.on_stop` in Chainlit).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from agents import RawResponsesStreamEvent, RunItemStreamEvent, RunResultStreaming
+from agents.result import QueueCompleteSentinel
+
+
+@dataclass
+class CancelReport:
+    reason: str
+    elapsed_seconds: float
+    output_tokens: int  # generated before the cancel (reported usage, or the deltas seen if more)
+    tools_interrupted: int
+    est_tokens_saved: Optional[int]  # None until a run of the tracker has finished normally
+    est_seconds_saved: Optional[float]
+
+    def summary(self) -> str:
+        """One line for a log file."""
+        saved = ("no estimate yet" if self.est_tokens_saved is None
+                 else f"saved ~{self.est_tokens_saved} tokens, ~{self.est_seconds_saved}s")
+        return (f"{self.reason} after {self.elapsed_seconds}s, {self.output_tokens} output tokens, "
+                f"{self.tools_interrupted} tools interrupted; {saved}")
+
+
+class CancellationTracker:
+    """
+    Learns how long runs take and how many tokens they produce (moving averages of the runs that
+    finished), to estimate what a cancel saved, and sums it up.
+
+    Args:
+        alpha (float): Weight of the newest finished run in the averages.
+    """
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self.avg_seconds: Optional[float] = None
+        self.avg_output_tokens: Optional[float] = None
+        self.finished = 0
+        self.cancelled = 0
+        self.tokens_saved = 0
+        self.seconds_saved = 0.0
+
+    def _ewma(self, old: Optional[float], new: float) -> float:
+        return new if old is None else (1 - self.alpha) * old + self.alpha * new
+
+    def finished_run(self, seconds: float, output_tokens: int) -> None:
+        self.finished += 1
+        self.avg_seconds = self._ewma(self.avg_seconds, seconds)
+        self.avg_output_tokens = self._ewma(self.avg_output_tokens, output_tokens)
+
+    def cancelled_run(self, report: CancelReport) -> None:
+        self.cancelled += 1
+        self.tokens_saved += report.est_tokens_saved or 0
+        self.seconds_saved += report.est_seconds_saved or 0.0
+
+    def track(self, result: RunResultStreaming) -> "CancellableRun":
+        return CancellableRun(result, self)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "finished": self.finished,
+            "cancelled": self.cancelled,
+            "est_tokens_saved": self.tokens_saved,
+            "est_seconds_saved": round(self.seconds_saved, 3),
+        }
+
+
+class CancellableRun:
+    """
+    Args:
+        result (RunResultStreaming): From `Runner.run_streamed(...)`. Wrap it right away (after a
+            `StreamFilter.attach`, if any, so every event is seen).
+        tracker (CancellationTracker): Shared by the runs of an app, for the estimates.
+    """
+
+    def __init__(self, result: RunResultStreaming, tracker: Optional[CancellationTracker] = None) -> None:
+        self.result = result
+        self.tracker = tracker
+        self.started = time.perf_counter()
+        self.report: Optional[CancelReport] = None
+        self._deltas = 0  # about one token each; counts when the provider reports no usage
+        self._tool_calls = 0
+        self._tool_outputs = 0
+
+        # Watch the events where the run enqueues them, before any reader or filter
+        queue = result._event_queue
+        put = queue.put_nowait
+
+        def put_nowait(event: Any) -> None:
+            put(event)  # first: a failing observer must not lose the event (or the end marker)
+            self._observe(event)
+
+        queue.put_nowait = put_nowait
+
+        # Finished runs are counted when the run's task ends (failed runs queue the end marker too)
+        task = getattr(result, "_run_impl_task", None)
+        if task is not None:
+            task.add_done_callback(self._run_done)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.report is not None
+
+    def _observe(self, event: Any) -> None:
+        if isinstance(event, RawResponsesStreamEvent):
+            if event.data.type.endswith(".delta"):
+                self._deltas += 1
+        elif isinstance(event, RunItemStreamEvent):
+            if event.item.type == "tool_call_item":
+                self._tool_calls += 1
+            elif event.item.type == "tool_call_output_item":
+                self._tool_outputs += 1
+
+    def _run_done(self, task: "asyncio.Task[Any]") -> None:
+        if self.cancelled or self.tracker is None or task.cancelled() or task.exception() is not None:
+            return  # only runs that finished normally teach the tracker
+        if self.result._stored_exception is None:
+            self.tracker.finished_run(time.perf_counter() - self.started, self._output_tokens())
+
+    def _output_tokens(self) -> int:
+        wrapper = getattr(self.result, "context_wrapper", None)  # not on openai-agents<0.0.14
+        return max(wrapper.usage.output_tokens if wrapper is not None else 0, self._deltas)
+
+    def cancel(self, reason: str = "cancelled") -> CancelReport:
+        """Stop the run now (idempotent). Safe to call from any callback of the same event loop."""
+        if self.report is not None:
+            return self.report
+        finished = self.result.is_complete
+        if finished:
+            reason = f"{reason} (run had already finished)"
+        elapsed = time.perf_counter() - self.started
+        output_tokens = self._output_tokens()
+        tools = max(0, self._tool_calls - self._tool_outputs)
+
+        est_tokens = est_seconds = None
+        tracker = self.tracker
+        if tracker is not None and tracker.avg_output_tokens is not None and not finished:
+            est_tokens = max(0, round(tracker.avg_output_tokens - output_tokens))
+            est_seconds = round(max(0.0, tracker.avg_seconds - elapsed), 3)
+        self.report = CancelReport(reason, round(elapsed, 3), output_tokens, tools, est_tokens, est_seconds)
+
+        self.result.cancel()  # cancels the run task: model stream, tool calls, sub-agents, guardrails
+        self.result._event_queue.put_nowait(QueueCompleteSentinel())  # wake up stream_events()
+        if tracker is not None and not finished:
+            tracker.cancelled_run(self.report)
+        return self.report
+
+    def stream_events(self):
+        return self.result.stream_events()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.result, name)
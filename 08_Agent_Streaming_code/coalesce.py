@@ -0,0 +1,161 @@
+"""
+Coalesced Streaming
+-------------------
+The Chainlit UIs (05, 10, 19, Chainlit/) call `await msg.stream_token(event.data.delta)` for every
+raw delta: one websocket frame and one await per token. With many chats at once, that is
+where the CPU goes.
+
+`CoalescedStream` sits on `result.stream_events()` and merges consecutive text deltas into one
+chunk, sent when:
+
+- the chunk reaches `max_bytes` (UTF-8), or
+- `max_delay` seconds passed since its first delta, or
+- a non-text event arrives (tool call, new item, ...), which is passed on right after it.
+
+The merged chunk is an ordinary `raw_response_event` with a `ResponseTextDeltaEvent`, so loops
+that check `isinstance(event.data, ResponseTextDeltaEvent)` need no change. The very first delta
+is sent at once (`eager_first`), so time-to-first-token does not change. A 30 ms window is
+shorter than a user can notice, yet at normal generation speed it holds several tokens.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Optional
+
+from openai.types.responses import ResponseTextDeltaEvent
+from agents import RawResponsesStreamEvent, RunResultStreaming
+
+_END = object()
+
+
+@dataclass
+class FlushPolicy:
+    """
+    Args:
+        max_bytes (int): Flush when the chunk reaches this many UTF-8 bytes.
+        max_delay (float): Flush this many seconds after the chunk's first delta.
+        eager_first (bool): Send the first delta of the run at once.
+        newline (bool): Also flush after a delta ending a line (line-by-line UIs, logs).
+        prefetch (int): Events read ahead of the reader.
+    """
+
+    max_bytes: int = 256
+    max_delay: float = 0.03
+    eager_first: bool = True
+    newline: bool = False
+    prefetch: int = 256
+
+
+def _text_delta(event: Any) -> Optional[ResponseTextDeltaEvent]:
+    if isinstance(event, RawResponsesStreamEvent) and isinstance(event.data, ResponseTextDeltaEvent):
+        return event.data
+    return None
+
+
+class CoalescedStream:
+    """
+    Args:
+        result (RunResultStreaming): From `Runner.run_streamed(...)`.
+        policy (FlushPolicy): When to send a chunk.
+    """
+
+    def __init__(self, result: RunResultStreaming, policy: Optional[FlushPolicy] = None) -> None:
+        self.result = result
+        self.policy = policy or FlushPolicy()
+        self.deltas_in = 0
+        self.chunks_out = 0
+        self.events_out = 0
+        self._parts: List[str] = []
+        self._bytes = 0
+        self._first: Optional[ResponseTextDeltaEvent] = None
+        self._deadline = 0.0
+
+    def _add(self, delta: ResponseTextDeltaEvent) -> None:
+        if not self._parts:
+            self._first = delta
+            self._deadline = time.monotonic() + self.policy.max_delay
+        self._parts.append(delta.delta)
+        self._bytes += len(delta.delta.encode("utf-8"))
+
+    def _same_part(self, delta: ResponseTextDeltaEvent) -> bool:
+        first = self._first
+        return (first is not None and first.item_id == delta.item_id
+                and first.output_index == delta.output_index and first.content_index == delta.content_index)
+
+    def _full(self) -> bool:
+        if self._bytes >= self.policy.max_bytes:
+            return True
+        return self.policy.newline and self._parts[-1].endswith("\n")
+
+    def _flush(self) -> Optional[RawResponsesStreamEvent]:
+        if not self._parts:
+            return None
+        data = self._first.model_copy(update={"delta": "".join(self._parts)})
+        self._parts, self._bytes, self._first = [], 0, None
+        self.chunks_out += 1
+        self.events_out += 1
+        return RawResponsesStreamEvent(data=data)
+
+    async def stream_events(self) -> AsyncIterator[Any]:
+        # The run is read by a pump task, so a pending chunk can be flushed on time
+        # even while no new event arrives. Its queue is bounded: a slow reader still slows
+        # down the run (see bounded_stream.py) instead of piling events up here.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.policy.prefetch)
+
+        async def pump() -> None:
+            try:
+                async for event in self.result.stream_events():
+                    await queue.put(event)
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(_END)
+
+        task = asyncio.create_task(pump())
+        try:
+            while True:
+                if not queue.empty():
+                    event = queue.get_nowait()
+                elif self._parts:
+                    try:
+                        event = await asyncio.wait_for(queue.get(), max(0.0, self._deadline - time.monotonic()))
+                    except asyncio.TimeoutError:
+                        yield self._flush()
+                        continue
+                else:
+                    event = await queue.get()
+
+                if event is _END or isinstance(event, Exception):
+                    chunk = self._flush()
+                    if chunk is not None:
+                        yield chunk
+                    if event is _END:
+                        return
+                    raise event
+
+                delta = _text_delta(event)
+                if delta is None:
+                    chunk = self._flush()
+                    if chunk is not None:
+                        yield chunk
+                    self.events_out += 1
+                    yield event
+                    continue
+
+                self.deltas_in += 1
+                if self._parts and not self._same_part(delta):
+                    yield self._flush()
+                self._add(delta)
+                if (self.policy.eager_first and self.deltas_in == 1) or self._full():
+                    yield self._flush()
+        finally:
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "deltas_in": self.deltas_in,
+            "chunks_out": self.chunks_out,
+            "events_out": self.events_out,
+            "reduction": round(self.deltas_in / self.chunks_out, 1) if self.chunks_out else None,
+        }
@@ -0,0 +1,89 @@
+"""
+Filtered Streaming
+------------------
+Most readers of `result.stream_events()` want one kind of event: the Chainlit UIs want text
+deltas, the second example in `main.py` wants item events and `continue`s past every raw event.
+Every unwanted event is still queued, awaited, handed to the loop and compared, once per token.
+
+`StreamFilter` subscribes a streamed run to event types (and optionally item types and raw
+response types). Events nobody subscribed to are discarded where the run enqueues them, so they
+never reach the queue, `stream_events()` or your loop. The end-of-run marker always gets through.
+
+What it does not save: the model still parses every response event (about 10 us per delta) and
+the SDK still wraps it in a stream event (about 0.8 us) before the filter sees it. Dropping
+deltas inside the model would need a wrapped model on every agent of the run, and the SDK needs
+`response.completed` from it anyway; the wrapper is under a tenth of the per-delta cost.
+
+    result = run_streamed(agent, "Hello", events={"run_item_stream_event"},
+                          items={"tool_call_item", "message_output_item"})
+"""
+
+from collections import Counter
+from typing import Any, Iterable, Optional, Set
+
+from agents import Agent, RawResponsesStreamEvent, RunItemStreamEvent, RunResultStreaming
+from agents.stream_events import AgentUpdatedStreamEvent
+
+EVENT_TYPES = {"raw_response_event", "run_item_stream_event", "agent_updated_stream_event"}
+_STREAM_EVENTS = (RawResponsesStreamEvent, RunItemStreamEvent, AgentUpdatedStreamEvent)
+
+
+class StreamFilter:
+    """
+    Args:
+        events (set): Event types to deliver (None = all): "raw_response_event",
+            "run_item_stream_event", "agent_updated_stream_event".
+        items (set): For item events, the item types to deliver (None = all), e.g.
+            "tool_call_item", "tool_call_output_item", "message_output_item", "handoff_output_item".
+        raw (set): For raw events, the response event types to deliver (None = all), e.g.
+            "response.output_text.delta".
+    """
+
+    def __init__(self, events: Optional[Iterable[str]] = None, items: Optional[Iterable[str]] = None,
+                 raw: Optional[Iterable[str]] = None) -> None:
+        self.events: Optional[Set[str]] = set(events) if events is not None else None
+        self.items: Optional[Set[str]] = set(items) if items is not None else None
+        self.raw: Optional[Set[str]] = set(raw) if raw is not None else None
+        if self.events is not None and self.events - EVENT_TYPES:
+            raise ValueError(f"unknown event types {sorted(self.events - EVENT_TYPES)}; use {sorted(EVENT_TYPES)}")
+        self.delivered = 0
+        self.suppressed: Counter = Counter()
+
+    def accepts(self, event: Any) -> bool:
+        if not isinstance(event, _STREAM_EVENTS):
+            return True  # QueueCompleteSentinel and anything unknown
+        if self.events is not None and event.type not in self.events:
+            return False
+        if self.items is not None and isinstance(event, RunItemStreamEvent):
+            return event.item.type in self.items
+        if self.raw is not None and isinstance(event, RawResponsesStreamEvent):
+            return event.data.type in self.raw
+        return True
+
+    def attach(self, result: RunResultStreaming) -> RunResultStreaming:
+        """Filter `result`'s events. Call it right after `run_streamed`, before awaiting anything."""
+        queue = result._event_queue
+        put = queue.put_nowait  # also works on top of a BoundedEventQueue
+
+        def put_nowait(event: Any) -> None:
+            if self.accepts(event):
+                self.delivered += 1
+                put(event)
+            else:
+                self.suppressed[getattr(event, "type", type(event).__name__)] += 1
+
+        queue.put_nowait = put_nowait
+        return result
+
+    def stats(self) -> dict:
+        return {"delivered": self.delivered, "suppressed": dict(self.suppressed)}
+
+
+def run_streamed(starting_agent: Agent, input: Any, events: Optional[Iterable[str]] = None,
+                 items: Optional[Iterable[str]] = None, raw: Optional[Iterable[str]] = None,
+                 **kwargs: Any) -> RunResultStreaming:
+    """`Runner.run_streamed(...)` (through the default runner) that only streams the subscribed events."""
+    from agents.run import get_default_agent_runner  # not in openai-agents<0.1.0, unlike StreamFilter
+
+    result = get_default_agent_runner().run_streamed(starting_agent, input, **kwargs)
+    return StreamFilter(events, items, raw).attach(result)
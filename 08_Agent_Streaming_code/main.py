@@ -3,6 +3,7 @@
 import asyncio
 from openai.types.responses import ResponseTextDeltaEvent
 from agents import Agent, Runner
+from bounded_stream import BoundedRunner
 
 async def main():
     agent = Agent(
@@ -10,7 +11,9 @@ async def main():
         instructions="You are a helpful assistant.",
     )
 
-    result = Runner.run_streamed(agent, input="Please tell me 5 jokes.")
+    # A print loop is a slow reader: at most 64 events wait for it, extra deltas are merged
+    runner = BoundedRunner(max_events=64, policy="coalesce")
+    result = runner.run_streamed(agent, input="Please tell me 5 jokes.")
     async for event in result.stream_events():
         if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
             print(event.data.delta, end="", flush=True)
@@ -28,6 +31,7 @@ if __name__ == "__main__":
 import asyncio
 import random
 from agents import Agent, ItemHelpers, Runner, function_tool
+from filtered_stream import StreamFilter
 
 @function_tool
 def how_many_jokes() -> int:
@@ -41,18 +45,17 @@ async def main():
         tools=[how_many_jokes],
     )
 
-    result = Runner.run_streamed(
+    # Raw response deltas are dropped before they are queued, so the loop never sees them
+    no_deltas = StreamFilter(events={"agent_updated_stream_event", "run_item_stream_event"})
+    result = no_deltas.attach(Runner.run_streamed(
         agent,
         input="Hello",
-    )
+    ))
     print("=== Run starting ===")
 
     async for event in result.stream_events():
-        # We'll ignore the raw responses event deltas
-        if event.type == "raw_response_event":
-            continue
         # When the agent updates, print that
-        elif event.type == "agent_updated_stream_event":
+        if event.type == "agent_updated_stream_event":
             print(f"Agent updated: {event.new_agent.name}")
             continue
         # When items are generated, print them
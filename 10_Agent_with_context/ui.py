@@ -3,11 +3,15 @@
 import chainlit as cl
 from main import ai_agent
 from agents import Runner
+from coalesce import CoalescedStream
+from filtered_stream import StreamFilter
 
 @cl.on_chat_start
 async def start():
     await cl.Message(content="Hello! I'm your Assistant agent.").send()
     cl.user_session.set("chat_history", [])
+    # One filter per chat, so its delivered / suppressed counts belong to this session
+    cl.user_session.set("text_only", StreamFilter(events={"raw_response_event"}, raw={"response.output_text.delta"}))
 
 @cl.on_message
 async def main(message: cl.Message):
@@ -24,13 +28,15 @@ async def main(message: cl.Message):
         input=history,
         context=user_info
     )
+    # This UI only shows text: other events are never queued for it
+    cl.user_session.get("text_only").attach(response)
 
     # 4) prepare a new chat message and send it
     msg = cl.Message(content="")
     await msg.send()
 
-    # 5) stream each token into that message
-    async for event in response.stream_events():
+    # 5) stream the tokens into that message, in chunks (every 30 ms / 256 bytes)
+    async for event in CoalescedStream(response).stream_events():
         if event.type == "raw_response_event" and hasattr(event.data, "delta"):
             await msg.stream_token(event.data.delta)
 
@@ -1,5 +1,8 @@
-from agents import Agent, function_tool
+import asyncio
+
+from agents import Agent, Runner, function_tool
 from agents.extensions.visualization import draw_graph
+from pre_router import LanguageRouter, PreRoutedModel
 
 @function_tool
 def get_weather(city: str) -> str:
@@ -20,12 +23,22 @@ triage_agent = Agent(
     instructions="Handoff to the appropriate agent based on the language of the request.",
     handoffs=[spanish_agent, english_agent],
     tools=[get_weather],
+    # Clearly Spanish or clearly English input skips the triage LLM call
+    model=PreRoutedModel(None, routers=[
+        LanguageRouter({"es": spanish_agent.name, "en": english_agent.name}),
+    ]),
 )
 
-draw_graph(triage_agent)
-
+async def main():
+    # Drawing opens a viewer, so it happens when the script runs, not when it is imported
+    draw_graph(triage_agent).view()
+    draw_graph(triage_agent, filename="agents_graph")
 
+    for text in ["¿Hola, qué tal estás hoy?", "Hello, how are you today?"]:
+        result = await Runner.run(triage_agent, text)
+        print(f"{result.last_agent.name}: {result.final_output}")
+    print(triage_agent.model.stats())
 
-draw_graph(triage_agent).view()
 
-draw_graph(triage_agent, filename="agents_graph")
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,7 +2,10 @@ import os
 import asyncio
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
-from agents import Agent, Runner, set_tracing_disabled, set_default_openai_client, set_default_openai_api
+from agents import Agent, ModelSettings, Runner, set_tracing_disabled, set_default_openai_client, set_default_openai_api
+
+from parallel_tools import FanOut
+from tool_cache import DiskStore, ToolResultCache
 
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
@@ -41,28 +44,39 @@ italian_agent = Agent(
     model="gemini-2.5-flash-preview-04-17"
 )
 
+# At most 3 sub-agents at a time, 30s each; a late or failing one does not sink the others
+fan_out = FanOut(max_parallel=3, timeout=30)
+# Repeated phrases ("Hello", UI strings) are answered from tool_cache.db, without a sub-agent run
+translations = ToolResultCache(DiskStore("tool_cache.db", ttl=7 * 24 * 3600, max_entries=10_000))
+
 orchestrator_agent = Agent(
     name="orchestrator_agent",
     instructions=(
         "You are a translation agent. You use the tools given to you to translate."
-        "If asked for multiple translations, you call the relevant tools in order."
+        "If asked for multiple translations, you call all the relevant tools at once, in the same turn."
         "You never translate on your own, you always use the provided tools."
+        "If a tool did not finish, give the other translations and say which one is missing."
     ),
     tools=[
-        spanish_agent.as_tool(
+        fan_out.wrap(translations.as_tool(
+            spanish_agent,
             tool_name="translate_to_spanish",
             tool_description="Translate the user's message to Spanish",
-        ),
-        french_agent.as_tool(
+        )),
+        fan_out.wrap(translations.as_tool(
+            french_agent,
             tool_name="translate_to_french",
             tool_description="Translate the user's message to French",
-        ),
-        italian_agent.as_tool(
+        )),
+        fan_out.wrap(translations.as_tool(
+            italian_agent,
             tool_name="translate_to_italian",
             tool_description="Translate the user's message to Italian",
-        ),
+        ), timeout=20),
     ],
     model="gemini-2.5-flash-preview-04-17",
+    # Several tool calls in one turn run concurrently: the turn takes as long as the slowest one
+    model_settings=ModelSettings(parallel_tool_calls=True),
 )
 
 
@@ -71,6 +85,8 @@ async def main():
 
     orchestrator_result = await Runner.run(orchestrator_agent, msg)
     print(f"\n\nFinal response:\n{orchestrator_result.final_output}")
+    print(fan_out.stats())
+    print(translations.stats())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""
+Parallel Agents-as-Tools
+------------------------
+When the model emits several tool calls in one turn, the SDK already runs them together
+(`asyncio.gather`). Two things are missing for sub-agents made with `Agent.as_tool(...)`:
+
+- a limit: ten tool calls start ten sub-agent LLM calls at once, and
+- a deadline: one slow sub-agent holds back the whole turn, and an error loses everything.
+
+`FanOut` wraps such tools:
+
+- at most `max_parallel` of its tools run at the same time (a shared semaphore),
+- each call has a timeout (per tool, or the FanOut default). A late sub-agent is cancelled,
+  which also closes its LLM request,
+- a timeout or error becomes a short tool result instead of failing the run. The orchestrator
+  still gets the other results (partial results) and can say what is missing.
+
+Combine it with `ModelSettings(parallel_tool_calls=True)` and instructions that ask for all tool
+calls in one turn. Then a three-language request takes about as long as the slowest translation.
+"""
+
+import asyncio
+import dataclasses
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from agents import FunctionTool
+
+
+@dataclass
+class ToolStats:
+    calls: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    seconds: float = 0.0  # running, without waiting for a free slot
+
+
+class FanOut:
+    """
+    Args:
+        max_parallel (int): Tools of this FanOut running at the same time; the rest wait.
+        timeout (float): Default seconds per call, waiting time included (None = no limit).
+    """
+
+    def __init__(self, max_parallel: int = 4, timeout: Optional[float] = 60.0) -> None:
+        self.max_parallel = max_parallel
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._stats: Dict[str, ToolStats] = {}
+        self._active = 0
+        self.peak_parallel = 0
+        self._busy_since = 0.0
+        self.wall_seconds = 0.0  # time with at least one call running
+
+    def _enter(self) -> None:
+        if self._active == 0:
+            self._busy_since = time.perf_counter()
+        self._active += 1
+        self.peak_parallel = max(self.peak_parallel, self._active)
+
+    def _exit(self) -> None:
+        self._active -= 1
+        if self._active == 0:
+            self.wall_seconds += time.perf_counter() - self._busy_since
+
+    def wrap(self, tool: FunctionTool, timeout: Optional[float] = None) -> FunctionTool:
+        """The same tool (name, schema, is_enabled) with the limit, the timeout and partial results."""
+        invoke = tool.on_invoke_tool
+        limit = timeout if timeout is not None else self.timeout
+        stats = self._stats.setdefault(tool.name, ToolStats())
+
+        async def call(ctx, arguments: str) -> Any:
+            async with self._semaphore:
+                self._enter()
+                start = time.perf_counter()
+                try:
+                    return await invoke(ctx, arguments)
+                finally:
+                    stats.seconds += time.perf_counter() - start
+                    self._exit()
+
+        async def on_invoke_tool(ctx, arguments: str) -> Any:
+            stats.calls += 1
+            try:
+                return await asyncio.wait_for(call(ctx, arguments), limit)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                return f"{tool.name} did not finish within {limit:g}s. Answer with the other results."
+            except Exception as e:
+                stats.errors += 1
+                return f"{tool.name} failed ({type(e).__name__}: {e}). Answer with the other results."
+
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per tool calls/timeouts/errors; `speedup` is the summed running time over the wall time."""
+        serial = sum(s.seconds for s in self._stats.values())
+        return {
+            "tools": {name: dataclasses.asdict(s) for name, s in self._stats.items()},
+            "peak_parallel": self.peak_parallel,
+            "speedup": round(serial / self.wall_seconds, 2) if self.wall_seconds else None,
+        }
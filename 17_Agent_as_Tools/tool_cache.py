@@ -0,0 +1,209 @@
+"""
+Agent-as-Tool Result Cache
+--------------------------
+The translators in `main.py` get the same phrases again and again ("Hello", "Thank you",
+UI strings). Every call is a full sub-agent run: an LLM call plus its tracing spans.
+
+`ToolResultCache` remembers the final output of a sub-agent run:
+
+- The key is a SHA-256 of the tool name, the tool input (canonical JSON) and the sub-agent's
+  instructions, model and ModelSettings. Change the prompt or the model and old answers are
+  no longer used.
+- `MemoryStore` is an in-process LRU with an optional TTL. `DiskStore` keeps results in SQLite
+  across restarts.
+- A hit returns the stored output without starting the sub-agent at all: no model call and no
+  agent/generation spans (only the orchestrator's own function span remains).
+- Failed runs (the SDK's "An error occurred while running the tool..." result) are not stored.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from agents import Agent, FunctionTool, Model
+
+_TOOL_ERROR = "An error occurred while running the tool."
+
+
+# ─── Stores ──────────────────────────────────────────────────────────────────────
+
+class MemoryStore:
+    """
+    In-process LRU of up to `max_entries` results.
+
+    Args:
+        ttl (float): Seconds a result stays valid (None = forever).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        found = self._data.get(key)
+        if found is None:
+            return None
+        created, entry = found
+        if self.ttl is not None and time.time() - created > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self._data[key] = (time.time(), entry)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class DiskStore:
+    """
+    Results stored as JSON in a SQLite file. With `max_entries`, the least recently used
+    results are deleted first.
+
+    Args:
+        db_path (str): SQLite file (created if missing).
+        ttl (float): Seconds a result stays valid (None = forever).
+    """
+
+    def __init__(self, db_path: Union[str, Path] = "tool_cache.db", ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, entry TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT entry, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and time.time() - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, entry, created, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry), now, now),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY used DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def clear(self) -> None:
+        def _clear() -> None:
+            with self._lock:
+                self._conn.execute("DELETE FROM results")
+                self._conn.commit()
+
+        await asyncio.to_thread(_clear)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ─── The cache ───────────────────────────────────────────────────────────────────
+
+def _model_name(model: Any) -> str:
+    if isinstance(model, Model):
+        return f"{type(model).__name__}:{getattr(model, 'model', '')}"
+    return str(model)
+
+
+class ToolResultCache:
+    """
+    Args:
+        store: `MemoryStore()` (default) or `DiskStore(path)`.
+        namespace (str): Part of every key; change it to drop all old results.
+    """
+
+    def __init__(self, store: Any = None, namespace: str = "") -> None:
+        self.store = store if store is not None else MemoryStore()
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    async def key(self, agent: Agent, tool: FunctionTool, ctx: Any, arguments: str) -> str:
+        try:
+            arguments = json.dumps(json.loads(arguments or "{}"), sort_keys=True)
+        except ValueError:
+            pass  # hashed as sent
+        request = {
+            "namespace": self.namespace,
+            "tool": tool.name,
+            "input": arguments,
+            "instructions": await agent.get_system_prompt(ctx),  # dynamic instructions too
+            "model": _model_name(agent.model),
+            "settings": agent.model_settings.to_json_dict(),
+        }
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def wrap(self, tool: FunctionTool, agent: Agent) -> FunctionTool:
+        """`tool` (made by `agent.as_tool(...)`) answering repeated inputs from the cache."""
+        invoke = tool.on_invoke_tool
+
+        async def on_invoke_tool(ctx, arguments: str) -> Any:
+            key = await self.key(agent, tool, ctx, arguments)
+            entry = await self.store.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.seconds_saved += entry["seconds"]
+                return entry["output"]
+
+            self.misses += 1
+            start = time.perf_counter()
+            output = await invoke(ctx, arguments)
+            if isinstance(output, str) and not output.startswith(_TOOL_ERROR):
+                await self.store.set(key, {"output": output, "seconds": time.perf_counter() - start})
+            return output
+
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+    def as_tool(self, agent: Agent, **kwargs: Any) -> FunctionTool:
+        """`agent.as_tool(**kwargs)` with this cache in front."""
+        return self.wrap(agent.as_tool(**kwargs), agent)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "seconds_saved": round(self.seconds_saved, 3),
+        }
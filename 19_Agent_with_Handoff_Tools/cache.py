@@ -0,0 +1,189 @@
+"""
+Tool Result Cache
+-----------------
+TTL + LRU cache for the web search and news tools.
+
+- Every tool gets its own cache with its own TTL (headlines go stale faster than search results).
+- Entries are evicted least-recently-used when either the entry count or the total
+  byte size of the cached results goes over the limit.
+- Concurrent identical calls are coalesced: only the first one hits the API, the
+  others wait for that same in-flight request.
+- Hit / miss / coalesced / eviction counters are kept for monitoring.
+"""
+
+import asyncio
+import functools
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+class _FetchCancelled(Exception):
+    """Set on an in-flight fetch whose caller was cancelled."""
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+@dataclass
+class TTLCache:
+    """
+    Async TTL + LRU cache with request coalescing.
+
+    Args:
+        name (str): Name shown in stats.
+        ttl (float): Seconds an entry stays fresh.
+        max_entries (int): Maximum number of cached results.
+        max_bytes (int): Maximum total size of cached results (JSON-encoded).
+        should_cache (callable): Decides if a result is worth caching (skip errors).
+    """
+
+    name: str
+    ttl: float
+    max_entries: int = 256
+    max_bytes: int = 2_000_000
+    should_cache: Callable[[Any], bool] = lambda value: True
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def __post_init__(self) -> None:
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a fresh entry and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expired += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = len(json.dumps(value, default=str).encode())
+        if size > self.max_bytes:
+            return  # would evict everything else, not worth it
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, size, time.monotonic() + self.ttl)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, or call `fetch()` once and share it with concurrent callers."""
+        while True:
+            found, value = self.get(key)
+            if found:
+                self.stats.hits += 1
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _FetchCancelled:
+                self.stats.coalesced -= 1  # the caller fetching it was cancelled: try again
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting, so mark any exception as retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            if self.should_cache(value):
+                self.set(key, value)
+            return value
+        finally:
+            if not future.done():
+                # Cancelled (or interrupted) before a result: the callers waiting for it fetch again
+                future.set_exception(_FetchCancelled())
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+def _make_key(args: tuple, kwargs: dict) -> str:
+    return json.dumps([args, sorted(kwargs.items())], default=str)
+
+
+def cached(cache: TTLCache, key: Optional[Callable[..., Hashable]] = None):
+    """
+    Decorator that caches an async function's results in `cache`, keyed on its arguments.
+
+    `key` builds the cache key from the same arguments (e.g. to ignore case). The function
+    itself still receives the arguments unchanged.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = key(*args, **kwargs) if key else _make_key(args, kwargs)
+            return await cache.get_or_fetch(cache_key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def stats_report(*caches: TTLCache) -> Dict[str, Dict[str, Any]]:
+    """Plain dict of every cache's counters (easy to log or print)."""
+    return {
+        c.name: {
+            "entries": len(c),
+            "bytes": c.size_bytes,
+            "hits": c.stats.hits,
+            "misses": c.stats.misses,
+            "coalesced": c.stats.coalesced,
+            "evictions": c.stats.evictions,
+            "expired": c.stats.expired,
+            "hit_rate": round(c.stats.hit_rate, 3),
+        }
+        for c in caches
+    }
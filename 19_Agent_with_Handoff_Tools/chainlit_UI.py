@@ -1,7 +1,52 @@
+import asyncio
+
 import chainlit as cl
-from agents import Runner
+from agents import ItemHelpers, Runner
 from chainlit.types import ThreadDict
 from main import create_assistant_agent
+from coalesce import CoalescedStream
+from filtered_stream import StreamFilter
+from broadcast import Broadcast
+from cancellation import CancellationTracker
+from bounded_stream import BoundedRunner
+from agents.run import set_default_agent_runner
+
+# A slow browser cannot make a run queue unlimited events: at 256 queued events, new text
+# deltas are merged into the last queued one
+set_default_agent_runner(BoundedRunner(max_events=256, policy="coalesce"))
+
+# Text deltas for the chat, tool calls and answers for the audit log; nothing else is queued
+UI_EVENTS = StreamFilter(
+    events={"raw_response_event", "run_item_stream_event"},
+    raw={"response.output_text.delta"},
+    items={"tool_call_item", "message_output_item"},
+)
+
+# Estimates what cancelled runs saved, from the runs that finished
+tracker = CancellationTracker()
+
+
+async def audit_log(events):
+    """A second reader of the same run: writes tool calls and answers to history.txt."""
+    with open("history.txt", "a") as file:
+        async for event in events.stream_events():
+            if event.type != "run_item_stream_event":
+                continue
+            if event.item.type == "tool_call_item":
+                file.write(f"Tool: {getattr(event.item.raw_item, 'name', event.item.raw_item)}\n")
+            elif event.item.type == "message_output_item":
+                file.write(f"Assistant: {ItemHelpers.text_message_output(event.item)}\n")
+
+
+def cancel_run(reason: str) -> None:
+    """Stop the run of this chat, if one is streaming: no more tokens, tools or sub-agents."""
+    run = cl.user_session.get("run")
+    cl.user_session.set("run", None)
+    if run is None or run.is_complete:
+        return  # nothing is streaming any more
+    report = run.cancel(reason)
+    with open("history.txt", "a") as file:
+        file.write(f"Cancelled: {report.summary()}\n")
 
 @cl.on_chat_start
 async def on_chat_start():
@@ -32,6 +77,7 @@ async def main(message: cl.Message):
     user_message = {"role": "user", "content": message.content}
     history.append(user_message)
 
+    audit = None
     try:
         agent = create_assistant_agent()
         # Pass the entire history to the agent instead of just the current message
@@ -39,14 +85,29 @@ async def main(message: cl.Message):
             agent,
             input=history  # Changed from input=message.content to input=history
         )
+        # Tool-call argument deltas are not queued (they used to end up in the chat)
+        UI_EVENTS.attach(result)
+        # Cancelled by on_stop / on_chat_end below
+        run = tracker.track(result)
+        cl.user_session.set("run", run)
+
+        # One run, two readers: the chat message and the audit log
+        live = Broadcast(result)
+        audit = asyncio.create_task(audit_log(live.subscribe()))
 
         full_response = []
-        async for event in result.stream_events():
+        # Deltas are sent in chunks (every 30 ms / 256 bytes), not one websocket frame per token
+        async for event in CoalescedStream(live.subscribe()).stream_events():
             if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
                 token = event.data.delta
                 full_response.append(token)
                 await Aimsg.stream_token(token)
 
+        if run.cancelled:
+            # Stopped or disconnected: keep the partial text on screen, not in the history
+            await Aimsg.update()
+            return
+
         # Add assistant response to history
         assistant_response = ''.join(full_response)
         history.append({"role": "assistant", "content": assistant_response})
@@ -55,12 +116,30 @@ async def main(message: cl.Message):
         cl.user_session.set("history", history)
         await Aimsg.update()
 
-    except Exception as e:
-        await cl.Message(
-            content=f"⚠️ Error: {str(e)}",
-            author="System"
-        ).send()
+    except BaseException as e:
+        # The stream failed, or this task was cancelled: stop the run and its audit log too
+        if audit is not None:
+            audit.cancel()
+        cancel_run("stopped by user" if isinstance(e, asyncio.CancelledError) else "message handler failed")
+        if isinstance(e, Exception):
+            await cl.Message(
+                content=f"⚠️ Error: {str(e)}",
+                author="System"
+            ).send()
         raise
+    finally:
+        cl.user_session.set("run", None)
+        if audit is not None:
+            await asyncio.gather(audit, return_exceptions=True)
+
+@cl.on_stop
+async def on_stop():
+    cancel_run("stopped by user")
+
+@cl.on_chat_end
+async def on_chat_end():
+    # Tab closed or connection lost: nobody will read the rest of the answer
+    cancel_run("client disconnected")
 
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
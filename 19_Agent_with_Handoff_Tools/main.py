@@ -2,7 +2,7 @@ import os
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from agents import Agent, handoff, OpenAIChatCompletionsModel 
-from tools import search_everything, fetch_latest_news
+from tools import search_everything, search_many, fetch_latest_news
 
 # Load .env and API key
 load_dotenv()
@@ -29,9 +29,10 @@ def create_assistant_agent() -> Agent:
             "When a user asks for definitions, explanations, or factual details about any topic, "
             "use the `search_everything` tool to query the web, gather key points from credible sources, "
             "and return a clear, concise answer in your own words. "
+            "If you need several different queries, use `search_many` to run them at once. "
             "Always cite where you found the information."
         ),
-        tools=[search_everything],
+        tools=[search_everything, search_many],
         handoff_description="→ Handing off to GoogleSearcher for detailed web research",
         model=model,
     )
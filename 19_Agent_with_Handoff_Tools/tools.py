@@ -3,45 +3,93 @@ Agent Tools Module
 ------------------
 Provides search and news-fetching tools for agent workflows using external APIs.
 All API keys are loaded from environment variables for security.
+
+The tools are async and share one pooled httpx client per process, so they never
+block the agent loop and keep-alive connections to Serper/NewsAPI are reused.
+Results are cached (see cache.py) so repeated queries skip the paid API call.
 """
 
+import asyncio
 import os
-import requests
-import json
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
+
+import httpx
 from agents import function_tool as tool
 from dotenv import load_dotenv
 
+from cache import TTLCache, cached, stats_report
+
 load_dotenv()
 
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
-@tool
-def search_everything(query: str) -> Union[List[Dict[str, str]], Dict[str, str]]:
-    """
-    Search Google using the Serper API and return structured results.
+SERPER_URL = "https://google.serper.dev/search"
+NEWS_URL = "https://newsapi.org/v2/top-headlines"
 
-    Args:
-        query (str): The search query (e.g., 'latest AI news').
+# Per-call timeouts (seconds)
+SEARCH_TIMEOUT = 10.0
+NEWS_TIMEOUT = 10.0
+MAX_FAN_OUT = 5
 
-    Returns:
-        list: A list of search result dicts (Title, Link, Snippet).
-        dict: Error message in case of failure.
-    """
-    url = 'https://google.serper.dev/search'
+# Cache lifetimes (seconds): headlines change every few minutes, search results much slower
+SEARCH_TTL = 30 * 60
+NEWS_TTL = 5 * 60
+
+
+def _is_success(value: Any) -> bool:
+    # Never cache error results, the next call should retry the API
+    if isinstance(value, dict) and "error" in value:
+        return False
+    return not (isinstance(value, str) and value.startswith("Error:"))
+
+
+search_cache = TTLCache("search_everything", ttl=SEARCH_TTL, max_entries=500,
+                        max_bytes=5_000_000, should_cache=_is_success)
+news_cache = TTLCache("fetch_latest_news", ttl=NEWS_TTL, max_entries=100,
+                      max_bytes=500_000, should_cache=_is_success)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(15.0, connect=5.0),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (e.g. from a Chainlit on_stop / shutdown hook)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _query_key(query: str) -> str:
+    # "Latest AI news" and "latest  ai news" share one cache entry
+    return " ".join(query.lower().split())
+
+
+@cached(search_cache, key=_query_key)
+async def _search(query: str) -> Union[List[Dict[str, str]], Dict[str, str]]:
     headers = {
-        'X-API-KEY': SERPER_API_KEY,
+        'X-API-KEY': SERPER_API_KEY or '',
         'Content-Type': 'application/json'
     }
-    payload = {'q': query}
-
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+        response = await get_http_client().post(
+            SERPER_URL, headers=headers, json={'q': query}, timeout=SEARCH_TIMEOUT
+        )
         response.raise_for_status()
         data = response.json()
         results = data.get('organic', [])
-        output = [
+        return [
             {
                 'Title': result.get('title', ''),
                 'Link': result.get('link', ''),
@@ -49,12 +97,63 @@ def search_everything(query: str) -> Union[List[Dict[str, str]], Dict[str, str]]
             }
             for result in results
         ]
-        return output
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, ValueError, KeyError) as e:  # ValueError: body is not JSON
         return {"error": f"An error occurred: {e}"}
 
+
+@cached(news_cache)
+async def _latest_news(category: str, country: str) -> Union[str, Dict[str, str]]:
+    params = {'category': category, 'country': country, 'apiKey': NEWS_API_KEY or ''}
+    try:
+        response = await get_http_client().get(NEWS_URL, params=params, timeout=NEWS_TIMEOUT)
+        if response.status_code != 200:
+            return f"Error: Unable to fetch news (Status Code: {response.status_code})"
+        articles = response.json().get('articles', [])
+        if not articles:
+            return "No news articles found."
+        news = [
+            f"{i+1}. {article['title']} (Source: {article['source']['name']})"
+            for i, article in enumerate(articles[:5])
+        ]
+        return "\n".join(news)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@tool
+async def search_everything(query: str) -> Union[List[Dict[str, str]], Dict[str, str]]:
+    """
+    Search Google using the Serper API and return structured results.
+
+    Args:
+        query (str): The search query (e.g., 'latest AI news').
+
+    Returns:
+        list: A list of search result dicts (Title, Link, Snippet).
+        dict: Error message in case of failure.
+    """
+    return await _search(query)
+
+
 @tool
-def fetch_latest_news(category: str = 'general', country: str = 'us') -> Union[str, Dict[str, str]]:
+async def search_many(queries: List[str]) -> Dict[str, Any]:
+    """
+    Search Google for several queries at once. Use this instead of calling
+    `search_everything` repeatedly when you need results for more than one query.
+
+    Args:
+        queries (list): Up to 5 search queries.
+
+    Returns:
+        dict: Maps each query to its list of results (or an error dict).
+    """
+    queries = queries[:MAX_FAN_OUT]
+    results = await asyncio.gather(*(_search(q) for q in queries))
+    return dict(zip(queries, results))
+
+
+@tool
+async def fetch_latest_news(category: str = 'general', country: str = 'us') -> Union[str, Dict[str, str]]:
     """
     Fetches the latest news headlines from the NewsAPI.
 
@@ -66,21 +165,9 @@ def fetch_latest_news(category: str = 'general', country: str = 'us') -> Union[s
         str: The latest news headlines.
         dict: Error message in case of failure.
     """
-    url = f"https://newsapi.org/v2/top-headlines?category={category}&country={country}&apiKey={NEWS_API_KEY}"
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            articles = data.get('articles', [])
-            if articles:
-                news = [
-                    f"{i+1}. {article['title']} (Source: {article['source']['name']})"
-                    for i, article in enumerate(articles[:5])
-                ]
-                return "\n".join(news)
-            else:
-                return "No news articles found."
-        else:
-            return f"Error: Unable to fetch news (Status Code: {response.status_code})"
-    except Exception as e:
-        return {"error": str(e)}
+    return await _latest_news(category.lower(), country.lower())
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters of the tool caches."""
+    return stats_report(search_cache, news_cache)
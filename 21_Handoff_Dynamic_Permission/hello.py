@@ -6,6 +6,7 @@ from openai import AsyncOpenAI
 from pydantic import BaseModel
 from agents import Agent, OpenAIChatCompletionsModel, Runner, set_tracing_disabled, handoff
 from agents.run import AgentRunner, set_default_agent_runner
+from pre_router import KeywordRouter, PreRoutedModel
 
 _ = load_dotenv(find_dotenv())
 
@@ -44,7 +45,12 @@ class UserContext(BaseModel):
 agent = Agent(
     name="Assistant",
     instructions="You only respond for the user's request and delegate to the expert agent if needed.",
-    model=OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client),
+    # Recursion questions go straight to the Expert, but only while its handoff is enabled:
+    # without permission the SDK hides the handoff and the pre-router falls back to the LLM.
+    model=PreRoutedModel(
+        OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client),
+        routers=[KeywordRouter({"Expert": ["recurs*", "memoiz*", "backtrack*"]})],
+    ),
 )
 
 expert_agent = Agent(
@@ -65,6 +71,7 @@ async def main():
         context=context,
     )
     print(result.final_output)
+    print(agent.model.stats())
 
 
 if __name__ == "__main__":
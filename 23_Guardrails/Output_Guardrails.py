@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from agents import Agent, Runner, GuardrailFunctionOutput, OutputGuardrail, output_guardrail
+from agents import Agent, Runner, GuardrailFunctionOutput, OutputGuardrail, output_guardrail, OutputGuardrailTripwireTriggered
+from streaming_guardrail import GuardedStream, StreamingOutputGuardrail
 import asyncio
 
 # Pydantic model for guardrail output
@@ -27,6 +28,14 @@ async def math_output_guardrail(ctx, agent, output: MessageOutput):
         tripwire_triggered=result.final_output.is_math
     )
 
+# Same check on a piece of streamed text (runs while the answer is still being generated)
+async def math_stream_guardrail(ctx, agent, text: str):
+    result = await Runner.run(guardrail_agent, text, context=ctx.context)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_math
+    )
+
 # Main agent
 main_agent = Agent(
     name="Response Agent",
@@ -48,5 +57,19 @@ async def main():
     except Exception as e:
         print("Error:", str(e))
 
+    # Streaming: check each sentence while it is generated and stop at the first math one
+    streaming_agent = Agent(name="Streaming Response Agent", instructions="Respond to user queries.")
+    guarded = GuardedStream(
+        Runner.run_streamed(streaming_agent, "Explain how to solve quadratic equations."),
+        [StreamingOutputGuardrail(math_stream_guardrail, name="math", split="sentence")],
+        hold_back=True,  # only show text that already passed the guardrail
+    )
+    try:
+        async for event in guarded.stream_events():
+            if event.type == "raw_response_event" and event.data.type == "response.output_text.delta":
+                print(event.data.delta, end="", flush=True)
+    except OutputGuardrailTripwireTriggered:
+        print(f"\nStopped after {guarded.tripped_at_chars} characters instead of the full answer")
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -3,9 +3,16 @@ from agents import Agent, Runner, GuardrailFunctionOutput, InputGuardrail, input
 from groq import Groq
 import asyncio , os
 from dotenv import load_dotenv
+from semantic_cache import SemanticVerdictCache
+from tiered_guardrail import LinearClassifier, LinearTier, RuleTier, TieredGuardrail
+from speculative_runner import SpeculativeRunner
 # Pydantic model for guardrail output
 set_tracing_disabled(True)
 load_dotenv()
+
+# The main agent's first LLM call starts next to the guardrails; its answer is held until they pass
+speculative_runner = SpeculativeRunner()
+
 class MathHomeworkOutput(BaseModel):
     is_math_homework: bool
     reasoning: str
@@ -21,8 +28,35 @@ guardrail_agent = Agent(
     
 )
 
+# Near-duplicate inputs reuse an earlier agent verdict instead of calling the guardrail agent again
+math_homework_cache = SemanticVerdictCache(threshold=0.85)
+
+# Obvious cases are decided locally; only uncertain inputs reach the guardrail agent
+math_rules = RuleTier(
+    "rules",
+    block=[
+        # an actual expression or math words, not any number ("solve the login issue, error 403")
+        r"\b(solve|simplify|evaluate|integrate|differentiate|factori[sz]e)\b.*"
+        r"(\d\s*[-+*/^=]\s*[\d(a-z]|\b[xyz]\b|\b(equation|expression|integral|derivative|polynomial|fraction)s?\b)",
+        r"\d+\s*[a-z]?\s*[-+*/^]\s*\d+\s*[a-z]?\s*=\s*\d+",  # 2x + 3 = 7
+        r"\b(math|maths|algebra|calculus|geometry|trigonometry)\s+(homework|assignment|worksheet)\b",
+    ],
+    allow=[r"\b(password|log ?in|account|refund|invoice|billing|subscription|order|shipping)\b"],
+)
+math_tiers = [math_rules]
+if os.path.exists("math_classifier.json"):  # python tiered_guardrail.py train math_verdicts.jsonl math_classifier.json --label is_math_homework
+    math_tiers.append(LinearTier("classifier", LinearClassifier.load("math_classifier.json")))
+
+math_homework_tiers = TieredGuardrail(
+    math_tiers,
+    make_info=lambda tripped, reason: MathHomeworkOutput(is_math_homework=tripped, reasoning=reason),
+    cache=math_homework_cache,  # asked after the local tiers, so rule verdicts are never cached
+    log_path="math_verdicts.jsonl",  # agent verdicts, to train the classifier tier
+)
+
 # Guardrail function
 @input_guardrail(name="Hi")
+@math_homework_tiers
 async def math_homework_guardrail(ctx, agent, input_data):
     result = await Runner.run(guardrail_agent, input_data, context=ctx.context)
     final_output = result.final_output
@@ -43,14 +77,25 @@ main_agent = Agent(
 async def main():
     try:
         # Test with non-math input
-        result = await Runner.run(main_agent, "How can I reset my password?")
+        result = await speculative_runner.run(main_agent, "How can I reset my password?")
         print("Result:", result.final_output)
 
         # Test with math homework input
-        result = await Runner.run(main_agent, "Solve 2x + 3 = 7 for x.")
+        result = await speculative_runner.run(main_agent, "Solve 2x + 3 = 7 for x.")
         print("Result:", result.final_output)
     except Exception as e:
         print("Error:", str(e))
 
+    try:
+        # No rule matches: the guardrail agent decides...
+        await speculative_runner.run(main_agent, "What's the probability of rolling two sixes with two dice?")
+        # ...and its near-duplicate is answered from the cache, no guardrail LLM call
+        await speculative_runner.run(main_agent, "what is the probability of rolling two sixes with two dice")
+    except Exception as e:
+        print("Error:", str(e))
+    print("Guardrail tiers:", math_homework_tiers.stats())
+    print("Guardrail cache:", math_homework_cache.stats())
+    print("Speculation:", speculative_runner.stats())
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,340 @@
+"""
+Semantic Guardrail Cache
+------------------------
+Guardrails like `math_homework_guardrail` run a full `Runner.run(guardrail_agent, ...)` for every
+request, although most inputs are near-duplicates of earlier ones
+("How can I reset my password?", "how do i reset my password").
+
+`SemanticVerdictCache` remembers each verdict (`GuardrailFunctionOutput`) together with an
+embedding of its input. A new input whose cosine similarity to a stored one is above
+`threshold` gets the stored verdict without any LLM call.
+
+- Embeddings come from a local hashing model (word + character n-grams, feature hashing):
+  CPU only, no downloads, no extra packages. Filler words ("how", "can", "the") are left out,
+  so rephrasings of the same question land on the same vector.
+- Negations and numbers flip meaning while changing only a few features, so an entry is
+  reused only when both match exactly ("solve my homework" never answers "don't solve my
+  homework").
+- The index is in-process: inverted lists find candidates sharing rare features with the
+  query, and those are scored with exact cosine similarity.
+- A sample of hits (`audit_rate`) is re-checked by the real guardrail in the background.
+  That gives the cache's precision, and a wrong entry is replaced by the new verdict.
+
+The examples below are checked with `python -m doctest semantic_cache.py`:
+
+>>> cache = SemanticVerdictCache(audit_rate=0.0)
+>>> cache.store("How can I reset my password?", GuardrailFunctionOutput(None, False))
+>>> cache.store("What is the capital of Brazil?", GuardrailFunctionOutput(None, False))
+>>> cache.store("Please solve my math homework problem", GuardrailFunctionOutput(None, True))
+>>> [cache.lookup(text) is not None for text in (
+...     "how do i reset my password",
+...     "capital of Brazil?",
+...     "what's the capital of brazil",
+... )]
+[True, True, True]
+>>> [cache.lookup(text) is not None for text in (
+...     "Please don't solve my math homework problem",
+...     "What is the capital of Peru?",
+...     "How can I change my email?",
+... )]
+[False, False, False]
+"""
+
+import asyncio
+import math
+import random
+import re
+import time
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from agents import GuardrailFunctionOutput
+
+Vector = Dict[int, float]
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+")
+_NEGATION = re.compile(
+    r"\b(?:not|no|never|nor|without|cannot"
+    r"|(?:do|does|did|is|are|was|were|ca|wo|would|should|could|have|has|had|must|need)n'?t)\b"
+)
+
+# Words that say nothing about what a question is about
+STOPWORDS = frozenset(
+    "a an the of to in on at for with about is are was were be am "
+    "i me my you your we our it this that what whats s how can could would do does did "
+    "please tell give".split()
+)
+
+
+class HashingEmbedder:
+    """
+    Sparse, L2-normalized vectors from hashed word unigrams, word bigrams and char n-grams.
+
+    Args:
+        dim (int): Number of hash buckets.
+        char_ngram (int): Length of character n-grams (catch typos and small rewordings).
+        numbers (bool): Keep numbers apart; by default "2x + 3 = 7" and "2x + 5 = 9" look the same.
+        stopwords (frozenset): Words left out of the features (a text made only of them keeps all).
+    """
+
+    def __init__(
+        self,
+        dim: int = 2 ** 18,
+        char_ngram: int = 3,
+        numbers: bool = False,
+        stopwords: FrozenSet[str] = frozenset(),
+    ) -> None:
+        self.dim = dim
+        self.char_ngram = char_ngram
+        self.numbers = numbers
+        self.stopwords = stopwords
+
+    def features(self, text: str) -> Counter:
+        text = text.lower().replace("\u2019", "'")
+        if not self.numbers:
+            text = _NUMBER.sub("0", text)
+        words = _WORD.findall(text)
+        words = [w for w in words if w not in self.stopwords] or words
+        feats = Counter(f"w:{w}" for w in words)
+        feats.update(f"b:{a} {b}" for a, b in zip(words, words[1:]))
+        joined = " " + " ".join(words) + " "
+        n = self.char_ngram
+        feats.update(f"c:{joined[i:i + n]}" for i in range(len(joined) - n + 1))
+        return feats
+
+    def embed(self, text: str) -> Vector:
+        vector: Vector = {}
+        for feat, count in self.features(text).items():
+            h = zlib.crc32(feat.encode("utf-8"))
+            index = h % self.dim
+            sign = 1.0 if (h >> 31) & 1 else -1.0  # signed hashing keeps collisions unbiased
+            vector[index] = vector.get(index, 0.0) + sign * (1.0 + math.log(count))
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {i: v / norm for i, v in vector.items()}
+
+
+class FlatIndex:
+    """
+    Cosine search over sparse vectors.
+
+    Candidates are found through inverted lists. Features shared by more than `max_posting`
+    entries (think "the", " wh") say nothing about similarity and are skipped for this step.
+    The best `rerank` candidates are then scored exactly. Near-duplicates share most of their
+    rare features, so they are always among the candidates.
+    """
+
+    def __init__(self, max_posting: int = 500, rerank: int = 32) -> None:
+        self.max_posting = max_posting
+        self.rerank = rerank
+        self._vectors: Dict[int, Vector] = {}
+        self._postings: Dict[int, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, entry_id: int, vector: Vector) -> None:
+        self._vectors[entry_id] = vector
+        for index in vector:
+            self._postings.setdefault(index, set()).add(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        vector = self._vectors.pop(entry_id, None) or {}
+        for index in vector:
+            ids = self._postings.get(index)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._postings[index]
+
+    @staticmethod
+    def cosine(a: Vector, b: Vector) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(value * b.get(index, 0.0) for index, value in a.items())
+
+    def search(
+        self, vector: Vector, accept: Callable[[int], bool] = lambda entry_id: True
+    ) -> Optional[Tuple[int, float]]:
+        """Best accepted (entry_id, cosine similarity), or None if nothing overlaps."""
+        partial: Dict[int, float] = {}
+        for index, value in vector.items():
+            ids = self._postings.get(index, ())
+            if len(ids) > self.max_posting:
+                continue
+            for entry_id in ids:
+                partial[entry_id] = partial.get(entry_id, 0.0) + abs(value * self._vectors[entry_id][index])
+        if not partial:
+            return None
+        candidates = [entry_id for entry_id in partial if accept(entry_id)]
+        if not candidates:
+            return None
+        candidates = sorted(candidates, key=partial.__getitem__, reverse=True)[: self.rerank]
+        scored = [(entry_id, self.cosine(vector, self._vectors[entry_id])) for entry_id in candidates]
+        return max(scored, key=lambda pair: pair[1])
+
+
+Signature = Tuple[bool, Tuple[str, ...]]
+
+
+def signature(text: str) -> Signature:
+    """(negated?, numbers): the part of a text that must match exactly before a verdict is reused."""
+    text = text.lower().replace("\u2019", "'")
+    return bool(_NEGATION.search(text)), tuple(_NUMBER.findall(text))
+
+
+@dataclass
+class CacheEntry:
+    text: str
+    verdict: GuardrailFunctionOutput
+    created: float
+    signature: Signature
+
+
+@dataclass
+class SemanticVerdictCache:
+    """
+    Args:
+        threshold (float): Minimum cosine similarity to reuse a verdict (1.0 = exact text only).
+        max_entries (int): Oldest entries are evicted first.
+        ttl (float): Seconds a verdict stays valid (None = forever).
+        audit_rate (float): Fraction of hits re-checked by the real guardrail to measure precision.
+    """
+
+    threshold: float = 0.85
+    max_entries: int = 10_000
+    ttl: Optional[float] = None
+    audit_rate: float = 0.05
+    embedder: HashingEmbedder = field(default_factory=lambda: HashingEmbedder(stopwords=STOPWORDS))
+
+    lookups: int = 0
+    hits: int = 0
+    audited: int = 0
+    agreed: int = 0
+
+    def __post_init__(self) -> None:
+        self._index = FlatIndex()
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._by_text: Dict[str, int] = {}
+        self._next_id = 0
+        self._audits: Set[asyncio.Task] = set()
+
+    def lookup(self, text: str) -> Optional[Tuple[GuardrailFunctionOutput, float]]:
+        """Return (cached verdict, similarity) for a similar enough input, else None."""
+        self.lookups += 1
+        wanted = signature(text)
+        found = self._index.search(
+            self.embedder.embed(text), accept=lambda entry_id: self._entries[entry_id].signature == wanted
+        )
+        if found is None or found[1] < self.threshold:
+            return None
+        entry = self._entries[found[0]]
+        if self.ttl is not None and time.monotonic() - entry.created > self.ttl:
+            self._drop(found[0])
+            return None
+        self.hits += 1
+        return entry.verdict, found[1]
+
+    def store(self, text: str, verdict: GuardrailFunctionOutput) -> None:
+        key = text.strip().lower()
+        if key in self._by_text:  # same text again: replace, do not duplicate
+            self._drop(self._by_text[key])
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = CacheEntry(text, verdict, time.monotonic(), signature(text))
+        self._by_text[key] = entry_id
+        self._index.add(entry_id, self.embedder.embed(text))
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is not None:
+            self._by_text.pop(entry.text.strip().lower(), None)
+        self._index.remove(entry_id)
+
+    def record_audit(self, cached: GuardrailFunctionOutput, actual: GuardrailFunctionOutput) -> None:
+        self.audited += 1
+        if cached.tripwire_triggered == actual.tripwire_triggered:
+            self.agreed += 1
+
+    def maybe_audit(
+        self,
+        text: str,
+        cached: GuardrailFunctionOutput,
+        recheck: Callable[[], Awaitable[GuardrailFunctionOutput]],
+    ) -> None:
+        """After a hit: re-check `audit_rate` of them with the real guardrail, in the background."""
+        if random.random() < self.audit_rate:
+            task = asyncio.create_task(self._audit(text, cached, recheck))
+            self._audits.add(task)
+            task.add_done_callback(self._audits.discard)
+
+    async def _audit(
+        self,
+        text: str,
+        cached: GuardrailFunctionOutput,
+        recheck: Callable[[], Awaitable[GuardrailFunctionOutput]],
+    ) -> None:
+        try:
+            actual = await recheck()
+        except Exception:
+            return
+        self.record_audit(cached, actual)
+        if actual.tripwire_triggered != cached.tripwire_triggered:
+            self.store(text, actual)  # fix the wrong neighbour for next time
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+            "audited": self.audited,
+            "precision": round(self.agreed / self.audited, 3) if self.audited else None,
+        }
+
+
+def input_text(input_data: Any) -> str:
+    """The text a guardrail sees: a plain string, or the text parts of a list of input items."""
+    if isinstance(input_data, str):
+        return input_data
+    parts: List[str] = []
+    for item in input_data:
+        content = item.get("content") if isinstance(item, dict) else getattr(item, "content", None)
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(p.get("text", "") for p in content if isinstance(p, dict))
+    return "\n".join(parts)
+
+
+GuardrailFunction = Callable[..., Awaitable[GuardrailFunctionOutput]]
+
+
+def cached_guardrail(cache: SemanticVerdictCache) -> Callable[[GuardrailFunction], GuardrailFunction]:
+    """
+    Decorator for an input guardrail function `(ctx, agent, input_data)`.
+    Put it *under* `@input_guardrail`. With a `TieredGuardrail`, pass the cache to it instead
+    (`TieredGuardrail(tiers, cache=...)`), so only the agent's verdicts are cached.
+    """
+
+    def decorator(func: GuardrailFunction) -> GuardrailFunction:
+        @wraps(func)
+        async def wrapper(ctx, agent, input_data):
+            text = input_text(input_data)
+            found = cache.lookup(text)
+            if found is not None:
+                verdict, _ = found
+                cache.maybe_audit(text, verdict, lambda: func(ctx, agent, input_data))
+                return verdict
+            verdict = await func(ctx, agent, input_data)
+            cache.store(text, verdict)
+            return verdict
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,280 @@
+"""
+Speculative Runs
+----------------
+With an input guardrail, the user waits for the guardrail agent's LLM call *and* the main
+agent's LLM call. The SDK already starts the first turn next to the guardrails, but:
+
+- tools the first turn calls are executed before the guardrails have passed,
+- a tripped guardrail does not stop the main model request (it runs to the end, paid for),
+- with `run_streamed`, the answer is shown before the guardrails have passed.
+
+`SpeculativeRunner` puts a gate in front of the main agent's model:
+
+- The first model call starts at once, **in parallel** with all input guardrails.
+- Its response (or its stream) is **held back** until every guardrail has passed, so no tool
+  runs and no text is shown for input that is later rejected.
+- When a tripwire fires, the in-flight model request is **cancelled** immediately.
+- Per agent, `stats()` reports the latency saved and the tokens wasted on rejected input.
+  Turn speculation off for agents where waste costs more than latency (`speculate=`): their
+  first call then waits for the guardrails and nothing is wasted.
+
+The runner does not clone the agent: it wraps the model and the guardrails where the SDK looks
+them up for a run (`_get_model`, `_run_input_guardrails*`), so `result.last_agent` and the
+items' `agent` are the agent you passed in. Those are private `AgentRunner` hooks of
+openai-agents 0.1.x and 0.2.x.
+"""
+
+import asyncio
+import dataclasses
+import json
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from agents import (
+    Agent,
+    InputGuardrail,
+    InputGuardrailTripwireTriggered,
+    Model,
+    ModelResponse,
+    RunConfig,
+    RunResult,
+    RunResultStreaming,
+)
+from agents.guardrail import InputGuardrailResult
+from agents.run import AgentRunner
+
+_END = object()
+
+
+@dataclass
+class SpeculationStats:
+    runs: int = 0
+    tripped: int = 0
+    speculative_calls: int = 0
+    wasted_calls: int = 0
+    wasted_tokens: int = 0  # actual usage, or the prompt estimate for a call cancelled mid-flight
+    saved_seconds: float = 0.0
+
+
+class _Gate:
+    """Opens when every input guardrail passed; fails with the tripwire exception otherwise."""
+
+    def __init__(self, guardrails: int, stats: SpeculationStats) -> None:
+        self.pending = guardrails
+        self.stats = stats
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def passed(self) -> None:
+        self.pending -= 1
+        if self.pending == 0 and not self.future.done():
+            self.future.set_result(time.perf_counter())
+
+    def fail(self, error: BaseException) -> None:
+        if not self.future.done():
+            self.future.set_exception(error)
+            self.future.exception()  # retrieved: the run may already be over
+
+
+
+class _GatedGuardrail:
+    """Runs one input guardrail and reports the outcome to the gate. Results keep the original guardrail."""
+
+    def __init__(self, guardrail: InputGuardrail, gate: _Gate) -> None:
+        self.guardrail = guardrail
+        self.gate = gate
+
+    def get_name(self) -> str:
+        return self.guardrail.get_name()
+
+    async def run(self, agent, input, context) -> InputGuardrailResult:
+        try:
+            result = await self.guardrail.run(agent, input, context)
+        except Exception as e:
+            self.gate.fail(e)
+            raise
+        if result.output.tripwire_triggered:
+            self.gate.stats.tripped += 1
+            self.gate.fail(InputGuardrailTripwireTriggered(result))
+        else:
+            self.gate.passed()
+        return result
+
+
+class _GatedModel(Model):
+    """Passes calls through once the gate is open; before that, runs them speculatively and holds them."""
+
+    def __init__(self, model: Model, gate: _Gate, stats: SpeculationStats, speculate: bool) -> None:
+        self.model = model
+        self.gate = gate
+        self.stats = stats
+        self.speculate = speculate
+
+    @staticmethod
+    def _estimate(system_instructions, input) -> int:
+        return (len(system_instructions or "") + len(json.dumps(input, default=str))) // 4
+
+    def _wasted(self, tokens: int) -> None:
+        self.stats.wasted_calls += 1
+        self.stats.wasted_tokens += tokens
+
+    def _saved(self, started: float, finished: Optional[float]) -> None:
+        opened = self.gate.future.result()
+        self.stats.saved_seconds += max(0.0, min(opened, finished or opened) - started)
+
+    async def get_response(self, system_instructions, input, *args: Any, **kwargs: Any) -> ModelResponse:
+        gate = self.gate.future
+        if gate.done() or not self.speculate:
+            await gate
+            return await self.model.get_response(system_instructions, input, *args, **kwargs)
+
+        self.stats.speculative_calls += 1
+        started = time.perf_counter()
+        call = asyncio.create_task(self.model.get_response(system_instructions, input, *args, **kwargs))
+        try:
+            await asyncio.wait({call, gate}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            call.cancel()
+            raise
+        if gate.done() and gate.exception() is not None:
+            if call.done() and call.exception() is None:
+                self._wasted(call.result().usage.total_tokens)
+            else:
+                call.cancel()
+                self._wasted(self._estimate(system_instructions, input))
+            raise gate.exception()
+
+        finished = None
+        if call.done():
+            finished = time.perf_counter()
+            try:
+                await gate  # hold the response until the guardrails passed
+            except BaseException:
+                if call.exception() is None:
+                    self._wasted(call.result().usage.total_tokens)
+                raise
+        response = await call
+        self._saved(started, finished)
+        return response
+
+    async def stream_response(self, system_instructions, input, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        gate = self.gate.future
+        if gate.done() or not self.speculate:
+            await gate
+            async for event in self.model.stream_response(system_instructions, input, *args, **kwargs):
+                yield event
+            return
+
+        # Buffer the stream in a pump task (which owns the generator from start to end)
+        self.stats.speculative_calls += 1
+        started = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue()
+        usage: Dict[str, int] = {}
+
+        async def pump() -> None:
+            try:
+                async for event in self.model.stream_response(system_instructions, input, *args, **kwargs):
+                    if getattr(event, "type", None) == "response.completed" and event.response.usage:
+                        usage["total"] = event.response.usage.total_tokens
+                    queue.put_nowait(event)
+            except Exception as e:
+                queue.put_nowait(e)
+            queue.put_nowait(_END)
+
+        task = asyncio.create_task(pump())
+        try:
+            try:
+                await asyncio.shield(gate)
+            except InputGuardrailTripwireTriggered:
+                self._wasted(usage.get("total", self._estimate(system_instructions, input)))
+                raise
+            self._saved(started, None)
+            while (event := await queue.get()) is not _END:
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        finally:
+            task.cancel()
+
+
+@dataclass
+class _Speculation:
+    """One gated run: its starting agent, the gate, and the gated model once the SDK asked for it."""
+
+    agent: Agent
+    gate: _Gate
+    stats: SpeculationStats
+    speculate: bool
+    model: Optional[_GatedModel] = None
+
+
+# Set while a run starts; the run's tasks copy it, so concurrent runs each see their own
+_current: ContextVar[Optional[_Speculation]] = ContextVar("speculation", default=None)
+
+
+class SpeculativeRunner(AgentRunner):
+    """
+    Args:
+        speculate (callable): Per starting agent: start its first model call before the
+            guardrails finished (True), or wait for them (False).
+    """
+
+    def __init__(self, speculate: Callable[[Agent], bool] = lambda agent: True) -> None:
+        super().__init__()
+        self.speculate = speculate
+        self._stats: Dict[str, SpeculationStats] = {}
+
+    def _speculation(self, starting_agent: Agent, run_config: Optional[RunConfig]) -> Optional[_Speculation]:
+        run_config = run_config or RunConfig()
+        guardrails = starting_agent.input_guardrails + (run_config.input_guardrails or [])
+        if not guardrails:
+            return None
+
+        stats = self._stats.setdefault(starting_agent.name, SpeculationStats())
+        stats.runs += 1
+        return _Speculation(starting_agent, _Gate(len(guardrails), stats), stats, self.speculate(starting_agent))
+
+    async def run(self, starting_agent: Agent, input: Any, **kwargs: Any) -> RunResult:
+        token = _current.set(self._speculation(starting_agent, kwargs.get("run_config")))
+        try:
+            return await super().run(starting_agent, input, **kwargs)
+        finally:
+            _current.reset(token)
+
+    def run_streamed(self, starting_agent: Agent, input: Any, **kwargs: Any) -> RunResultStreaming:
+        token = _current.set(self._speculation(starting_agent, kwargs.get("run_config")))
+        try:
+            return super().run_streamed(starting_agent, input, **kwargs)  # the run task copies the context here
+        finally:
+            _current.reset(token)
+
+    @classmethod
+    def _get_model(cls, agent: Agent, run_config: RunConfig) -> Model:
+        model = super()._get_model(agent, run_config)
+        speculation = _current.get()
+        if speculation is None or agent is not speculation.agent:
+            return model
+        if speculation.model is None:
+            speculation.model = _GatedModel(model, speculation.gate, speculation.stats, speculation.speculate)
+        return speculation.model
+
+    @staticmethod
+    def _gated(agent: Agent, guardrails: List[InputGuardrail]) -> List[Any]:
+        speculation = _current.get()
+        if speculation is None or agent is not speculation.agent:
+            return guardrails
+        return [_GatedGuardrail(guardrail, speculation.gate) for guardrail in guardrails]
+
+    @classmethod
+    async def _run_input_guardrails(cls, agent: Agent, guardrails: List[InputGuardrail], *args: Any, **kwargs: Any):
+        return await super()._run_input_guardrails(agent, cls._gated(agent, guardrails), *args, **kwargs)
+
+    @classmethod
+    async def _run_input_guardrails_with_queue(
+        cls, agent: Agent, guardrails: List[InputGuardrail], *args: Any, **kwargs: Any
+    ):
+        return await super()._run_input_guardrails_with_queue(agent, cls._gated(agent, guardrails), *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dataclasses.asdict(s) for name, s in self._stats.items()}
@@ -0,0 +1,201 @@
+"""
+Streaming Output Guardrails
+---------------------------
+A normal output guardrail (`math_output_guardrail` in Output_Guardrails.py) only sees the
+*final* output. A violating answer is generated in full, paid for in full, and the user
+waits for all of it before being rejected.
+
+`GuardedStream` wraps `Runner.run_streamed(...)` and checks the text *while it is generated*:
+
+- The text deltas are cut into segments at sentence boundaries (`split="sentence"`) or
+  every `window_chars` characters (`split="window"`). Each check also sees `context_chars`
+  of the text before the segment (a sliding window).
+- Checks run concurrently with generation, one at a time per guardrail. A check that starts
+  late takes all text generated so far, so every character is checked once.
+- When a tripwire fires, the run is cancelled at once (the model request is closed) and
+  `OutputGuardrailTripwireTriggered` is raised, as with a normal output guardrail.
+- With `hold_back=True`, an event is only passed on after the text it carries has passed
+  every guardrail, so violating text never reaches the user.
+
+The guardrail functions have the usual output-guardrail signature: `(ctx, agent, text) -> GuardrailFunctionOutput`.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from agents import OutputGuardrail, OutputGuardrailTripwireTriggered, RawResponsesStreamEvent, RunResultStreaming
+from agents.guardrail import OutputGuardrailResult
+
+_SENTENCE_END = re.compile(r"[.!?。؟](?:\s|$)|\n")
+_END = object()
+
+
+@dataclass
+class StreamingOutputGuardrail:
+    """
+    Args:
+        guardrail_function: `(ctx, agent, text) -> GuardrailFunctionOutput` (sync or async).
+        split (str): "sentence" or "window".
+        window_chars (int): Segment size for "window"; for "sentence", the longest segment
+            without a sentence end.
+        min_chars (int): Shortest segment for "sentence" (avoids one check per "Yes.").
+        context_chars (int): Text before the segment that is checked again with it.
+    """
+
+    guardrail_function: Callable[..., Any]
+    name: Optional[str] = None
+    split: str = "sentence"
+    window_chars: int = 200
+    min_chars: int = 40
+    context_chars: int = 200
+
+    checked_upto: int = field(default=0, init=False)
+    checks: int = field(default=0, init=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._guardrail = OutputGuardrail(guardrail_function=self.guardrail_function, name=self.name)
+
+    def next_cut(self, text: str, final: bool) -> int:
+        """End of the next segment to check, or `checked_upto` if it is not ready yet."""
+        if final:
+            return len(text)
+        pending = text[self.checked_upto:]
+        if self.split == "window":
+            if len(pending) < self.window_chars:
+                return self.checked_upto
+            return self.checked_upto + len(pending) - len(pending) % self.window_chars
+        ends = [m.end() for m in _SENTENCE_END.finditer(pending)]
+        if ends and ends[-1] >= self.min_chars:
+            return self.checked_upto + ends[-1]
+        if len(pending) >= self.window_chars:  # a very long sentence: do not wait for its end
+            return self.checked_upto + len(pending)
+        return self.checked_upto
+
+
+def _text_delta(event: Any) -> Optional[str]:
+    if isinstance(event, RawResponsesStreamEvent) and event.data.type == "response.output_text.delta":
+        return event.data.delta
+    return None
+
+
+class GuardedStream:
+    """
+    Args:
+        result (RunResultStreaming): From `Runner.run_streamed(...)`.
+        guardrails (list): `StreamingOutputGuardrail`s.
+        hold_back (bool): Pass events on only after their text passed every guardrail.
+    """
+
+    def __init__(self, result: RunResultStreaming, guardrails: List[StreamingOutputGuardrail],
+                 hold_back: bool = False) -> None:
+        self.result = result
+        self.guardrails = guardrails
+        self.hold_back = hold_back
+        self.text = ""
+        self.tripped: Optional[OutputGuardrailResult] = None
+        self.tripped_at_chars: Optional[int] = None
+        self._held: List[Tuple[int, Any]] = []  # (text length after the event, event)
+        self._pump: Optional[asyncio.Task] = None
+
+    # ─── Checks ──────────────────────────────────────────────────────────────────
+
+    def _schedule(self, guardrail: StreamingOutputGuardrail, final: bool = False) -> None:
+        if self.tripped is not None or (guardrail._task is not None and not guardrail._task.done()):
+            return
+        cut = guardrail.next_cut(self.text, final)
+        if cut <= guardrail.checked_upto:
+            return
+        window = self.text[max(0, guardrail.checked_upto - guardrail.context_chars):cut]
+        guardrail._task = asyncio.create_task(self._check(guardrail, window, cut, final))
+
+    async def _check(self, guardrail: StreamingOutputGuardrail, window: str, cut: int, final: bool) -> None:
+        guardrail.checks += 1
+        result = await guardrail._guardrail.run(
+            context=self.result.context_wrapper, agent=self.result.current_agent, agent_output=window
+        )
+        if result.output.tripwire_triggered:
+            if self.tripped is None:
+                self.tripped = result
+                self.tripped_at_chars = len(self.text)
+                self.result.cancel()  # stops the model stream and any tool calls
+                if self._pump is not None:
+                    self._pump.cancel()
+            return
+        guardrail.checked_upto = cut
+        self._schedule(guardrail, final)  # text may have arrived while we were checking
+
+    def _release(self, final: bool = False) -> List[Any]:
+        if not self.hold_back:
+            return []
+        safe = len(self.text) if final else min((g.checked_upto for g in self.guardrails), default=len(self.text))
+        released = []
+        while self._held and self._held[0][0] <= safe:
+            released.append(self._held.pop(0)[1])
+        return released
+
+    def _raise_if_tripped(self) -> None:
+        if self.tripped is not None:
+            raise OutputGuardrailTripwireTriggered(self.tripped)
+
+    # ─── Streaming ───────────────────────────────────────────────────────────────
+
+    async def stream_events(self) -> AsyncIterator[Any]:
+        # Read the run through our own queue: cancelling the run does not wake up a reader
+        # that is waiting inside `result.stream_events()`, but cancelling this pump does.
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump() -> None:
+            try:
+                async for event in self.result.stream_events():
+                    queue.put_nowait(event)
+            except Exception as e:
+                queue.put_nowait(e)
+            finally:
+                queue.put_nowait(_END)
+
+        self._pump = asyncio.create_task(pump())
+        try:
+            while (event := await queue.get()) is not _END:
+                if isinstance(event, Exception):
+                    raise event
+                delta = _text_delta(event)
+                if delta:
+                    self.text += delta
+                    for guardrail in self.guardrails:
+                        self._schedule(guardrail)
+                if self.hold_back:
+                    self._held.append((len(self.text), event))
+                    for ready in self._release():
+                        yield ready
+                else:
+                    yield event
+            self._raise_if_tripped()
+
+            # Check the tail that did not end with a full segment
+            for guardrail in self.guardrails:
+                while guardrail.checked_upto < len(self.text) and self.tripped is None:
+                    if guardrail._task is not None and not guardrail._task.done():
+                        await guardrail._task
+                    else:
+                        self._schedule(guardrail, final=True)
+                        if guardrail._task is not None:
+                            await guardrail._task
+            self._raise_if_tripped()
+            for ready in self._release(final=True):
+                yield ready
+        finally:
+            self._pump.cancel()
+            for guardrail in self.guardrails:
+                if guardrail._task is not None:
+                    guardrail._task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "chars_generated": len(self.text),
+            "tripped": self.tripped is not None,
+            "tripped_at_chars": self.tripped_at_chars,
+            "checks": {g._guardrail.get_name(): g.checks for g in self.guardrails},
+        }
@@ -0,0 +1,273 @@
+"""
+Tiered Guardrails
+-----------------
+Asking an LLM "is this math homework?" for "How can I reset my password?" or
+"Solve 2x + 3 = 7 for x." is overkill. A tiered guardrail asks cheap local tiers first:
+
+1. `RuleTier`: regex / keyword rules (microseconds)
+2. `LinearTier`: a small logistic-regression model trained on logged LLM verdicts (sub-millisecond)
+3. an optional `SemanticVerdictCache` of earlier agent verdicts
+4. the original guardrail function (the guardrail agent), only when nothing above decided
+
+Only verdicts of the guardrail agent are cached, and only those are appended to a JSONL
+log, so the linear model can be (re)trained from real traffic:
+
+    python tiered_guardrail.py train math_verdicts.jsonl math_classifier.json --label is_math_homework
+
+`stats()` shows, per tier, how many requests it decided and its average latency.
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+from pydantic import BaseModel
+from agents import GuardrailFunctionOutput
+
+from semantic_cache import HashingEmbedder, SemanticVerdictCache, Vector, input_text
+
+# A tier answers (tripwire_triggered, reason), or None when it is not sure
+TierVerdict = Optional[Tuple[bool, str]]
+
+
+class RuleTier:
+    """
+    Args:
+        name (str): Shown in stats.
+        block (list): Regexes that trip the guardrail.
+        allow (list): Regexes that clearly pass. When a block and an allow rule both match,
+            the rules disagree and a later tier decides.
+    """
+
+    def __init__(self, name: str, block: Sequence[str] = (), allow: Sequence[str] = ()) -> None:
+        self.name = name
+        self.block: List[Pattern] = [re.compile(p, re.IGNORECASE) for p in block]
+        self.allow: List[Pattern] = [re.compile(p, re.IGNORECASE) for p in allow]
+
+    def __call__(self, text: str) -> TierVerdict:
+        blocked = next((p for p in self.block if p.search(text)), None)
+        allowed = next((p for p in self.allow if p.search(text)), None)
+        if blocked is not None and allowed is not None:
+            return None  # conflicting rules: uncertain
+        if blocked is not None:
+            return True, f"matched block rule {blocked.pattern!r}"
+        if allowed is not None:
+            return False, f"matched allow rule {allowed.pattern!r}"
+        return None
+
+
+class LinearClassifier:
+    """Logistic regression over hashed n-gram features, trained with SGD. Pure Python."""
+
+    def __init__(self, embedder: Optional[HashingEmbedder] = None) -> None:
+        self.embedder = embedder or HashingEmbedder()
+        self.weights: Dict[int, float] = {}
+        self.bias = 0.0
+
+    def _score(self, vector: Vector) -> float:
+        z = self.bias + sum(value * self.weights.get(index, 0.0) for index, value in vector.items())
+        return 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+
+    def predict_proba(self, text: str) -> float:
+        return self._score(self.embedder.embed(text))
+
+    def fit(self, examples: Sequence[Tuple[str, bool]], epochs: int = 20,
+            lr: float = 0.5, l2: float = 1e-4, seed: int = 0) -> "LinearClassifier":
+        data = [(self.embedder.embed(text), 1.0 if label else 0.0) for text, label in examples]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for vector, label in data:
+                error = label - self._score(vector)
+                self.bias += lr * error
+                for index, value in vector.items():
+                    w = self.weights.get(index, 0.0)
+                    self.weights[index] = w + lr * (error * value - l2 * w)
+        return self
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps({
+            "dim": self.embedder.dim,
+            "char_ngram": self.embedder.char_ngram,
+            "numbers": self.embedder.numbers,
+            "bias": self.bias,
+            "weights": {str(k): v for k, v in self.weights.items()},
+        }))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LinearClassifier":
+        data = json.loads(Path(path).read_text())
+        model = cls(HashingEmbedder(data["dim"], data["char_ngram"], data["numbers"]))
+        model.bias = data["bias"]
+        model.weights = {int(k): v for k, v in data["weights"].items()}
+        return model
+
+
+class LinearTier:
+    """
+    Decides only outside the uncertain band: p >= `trip_above` trips, p <= `pass_below` passes.
+
+    Args:
+        name (str): Shown in stats.
+        classifier (LinearClassifier): A trained model.
+    """
+
+    def __init__(self, name: str, classifier: LinearClassifier,
+                 trip_above: float = 0.9, pass_below: float = 0.1) -> None:
+        self.name = name
+        self.classifier = classifier
+        self.trip_above = trip_above
+        self.pass_below = pass_below
+
+    def __call__(self, text: str) -> TierVerdict:
+        p = self.classifier.predict_proba(text)
+        if p >= self.trip_above:
+            return True, f"classifier p={p:.2f}"
+        if p <= self.pass_below:
+            return False, f"classifier p={p:.2f}"
+        return None
+
+
+# ─── Logged verdicts ─────────────────────────────────────────────────────────────
+
+def _as_dict(info: Any) -> Any:
+    return info.model_dump() if isinstance(info, BaseModel) else info
+
+
+def log_verdict(path: Union[str, Path], text: str, output: GuardrailFunctionOutput) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "input": text,
+            "tripwire_triggered": output.tripwire_triggered,
+            "output_info": _as_dict(output.output_info),
+        }, default=str) + "\n")
+
+
+def load_examples(path: Union[str, Path], label: Optional[str] = None) -> List[Tuple[str, bool]]:
+    """(input, label) pairs from a verdict log; `label` picks a field of output_info (e.g. is_math_homework)."""
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            info = row.get("output_info")
+            value = info.get(label) if label and isinstance(info, dict) else row["tripwire_triggered"]
+            examples.append((row["input"], bool(value)))
+    return examples
+
+
+# ─── The tiered guardrail ────────────────────────────────────────────────────────
+
+@dataclass
+class TierStats:
+    calls: int = 0
+    decided: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class TieredGuardrail:
+    """
+    Args:
+        tiers (list): Local tiers, cheapest first. Each returns (tripped, reason) or None.
+        make_info (callable): Builds `output_info` for a local verdict, e.g. a MathHomeworkOutput.
+        cache (SemanticVerdictCache): Asked after the local tiers, right before the guardrail agent.
+        log_path (str): Verdicts of the final (LLM) tier are appended here for training.
+    """
+
+    tiers: List[Callable[[str], TierVerdict]]
+    make_info: Callable[[bool, str], Any] = lambda tripped, reason: {"tripped": tripped, "reasoning": reason}
+    cache: Optional[SemanticVerdictCache] = None
+    log_path: Optional[str] = None
+
+    requests: int = 0
+    per_tier: Dict[str, TierStats] = field(default_factory=dict)
+
+    def _record(self, name: str, start: float, decided: bool) -> None:
+        stats = self.per_tier.setdefault(name, TierStats())
+        stats.calls += 1
+        stats.decided += int(decided)
+        stats.seconds += time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per tier: requests it decided, its share of all requests, and its average latency."""
+        report = {}
+        for name, s in self.per_tier.items():
+            report[name] = {
+                "decided": s.decided,
+                "hit_rate": round(s.decided / self.requests, 3) if self.requests else 0.0,
+                "avg_ms": round(s.seconds / s.calls * 1000, 3) if s.calls else 0.0,
+            }
+        return report
+
+    def __call__(self, func: Callable[..., Awaitable[GuardrailFunctionOutput]]):
+        """Use as a decorator on the (LLM) guardrail function; put it under `@input_guardrail`."""
+
+        @wraps(func)
+        async def wrapper(ctx, agent, input_data):
+            self.requests += 1
+            text = input_text(input_data)
+            for tier in self.tiers:
+                name = getattr(tier, "name", getattr(tier, "__name__", "tier"))
+                start = time.perf_counter()
+                verdict = tier(text)
+                self._record(name, start, verdict is not None)
+                if verdict is not None:
+                    tripped, reason = verdict
+                    return GuardrailFunctionOutput(
+                        output_info=self.make_info(tripped, f"{name}: {reason}"),
+                        tripwire_triggered=tripped,
+                    )
+
+            if self.cache is not None:
+                start = time.perf_counter()
+                found = self.cache.lookup(text)
+                self._record("cache", start, found is not None)
+                if found is not None:
+                    cached, _ = found
+                    self.cache.maybe_audit(text, cached, lambda: func(ctx, agent, input_data))
+                    return cached
+
+            start = time.perf_counter()
+            output = await func(ctx, agent, input_data)
+            self._record(func.__name__, start, True)
+            if self.cache is not None:
+                self.cache.store(text, output)
+            if self.log_path:
+                log_verdict(self.log_path, text, output)
+            return output
+
+        return wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the linear guardrail tier from logged verdicts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train")
+    train.add_argument("log", help="JSONL verdict log")
+    train.add_argument("model", help="where to save the classifier (JSON)")
+    train.add_argument("--label", help="output_info field to learn (default: tripwire_triggered)")
+    train.add_argument("--epochs", type=int, default=20)
+    args = parser.parse_args()
+
+    examples = load_examples(args.log, args.label)
+    rng = random.Random(0)
+    rng.shuffle(examples)
+    split = max(1, len(examples) // 5)
+    test, train_set = examples[:split], examples[split:] or examples
+    classifier = LinearClassifier().fit(train_set, epochs=args.epochs)
+    correct = sum((classifier.predict_proba(t) >= 0.5) == y for t, y in test)
+    print(f"trained on {len(train_set)}, held-out accuracy {correct / len(test):.1%} ({len(test)} examples)")
+    classifier.save(args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from openai.types.responses.response_input_image_param import ResponseInputImage
 from openai.types.responses.response_input_item_param import Message
 from agents.extensions.models.litellm_model import LitellmModel
 from dotenv import load_dotenv
+from pre_router import PreRoutedModel, KeywordRouter, RuleRouter
 import asyncio
 load_dotenv()
 set_tracing_disabled(True)
@@ -55,7 +56,11 @@ triage_Agent = Agent(
         "If the user asks about the weather in any city, hand off the request to the City agent. "
         "Otherwise, assist the user with their queries."
     ),
-    model=model,
+    # Obvious weather questions are handed to the City agent without asking the LLM first
+    model=PreRoutedModel(model, routers=[
+        RuleRouter([(r"\bweather\b.*\b(in|at|for)\b", "city_agent")]),
+        KeywordRouter({"city_agent": ["weather", "forecast", "temperature", "rain*", "sunny", "cloudy"]}),
+    ]),
     handoffs=[city_agent]
 )
 
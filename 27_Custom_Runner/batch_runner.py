@@ -0,0 +1,242 @@
+"""
+Batch Runner
+------------
+Processing thousands of independent prompts one `await Runner.run(...)` at a time
+(like 04_Multipal_Agents_code_Basic) leaves the provider idle most of the time.
+
+`BatchRunner` is an `AgentRunner` with a `run_batch` method that:
+
+- accepts a list, any iterable or an async iterator of inputs (read lazily),
+- runs at most `concurrency` agent runs at the same time,
+- yields results as they complete (`ordered=False`) or in input order (`ordered=True`),
+- applies a per-item timeout and retries transient errors with exponential backoff,
+- waits on a per-provider RPM/TPM `ProviderBudget`, so we stay under the rate limit
+  instead of triggering a storm of 429 errors.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Optional, Union
+
+import openai
+from agents import Agent, RunResult
+from agents.run import AgentRunner
+
+from rate_limit import ProviderBudget
+
+# Errors worth another attempt: the request itself was fine
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+@dataclass
+class BatchItem:
+    index: int
+    input: Any
+    result: Optional[RunResult] = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def estimate_tokens(input: Any) -> int:
+    """Rough prompt size (about 4 characters per token) plus room for the answer."""
+    return len(str(input)) // 4 + 500
+
+
+async def _iterate(inputs: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if hasattr(inputs, "__aiter__"):
+        async for item in inputs:
+            yield item
+    else:
+        for item in inputs:
+            yield item
+
+
+class BatchRunner(AgentRunner):
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, ProviderBudget]] = None,
+        provider_of: Callable[[Agent], str] = lambda agent: "default",
+        estimate: Callable[[Any], int] = estimate_tokens,
+    ) -> None:
+        """
+        Args:
+            budgets (dict): Provider name -> ProviderBudget. Shared by every batch of this runner.
+            provider_of (callable): Maps an agent to its provider name.
+            estimate (callable): Estimates the tokens one run will use, before it runs.
+        """
+        super().__init__()
+        self.budgets = budgets or {}
+        self.provider_of = provider_of
+        self.estimate = estimate
+
+    async def _run_one(
+        self,
+        index: int,
+        agent: Agent,
+        input: Any,
+        timeout: Optional[float],
+        retries: int,
+        backoff: float,
+        run_kwargs: Dict[str, Any],
+    ) -> BatchItem:
+        item = BatchItem(index=index, input=input)
+        budget = self.budgets.get(self.provider_of(agent))
+        start = time.perf_counter()
+
+        while True:
+            item.attempts += 1
+            estimated = self.estimate(input)
+            if budget is not None:
+                await budget.acquire(tokens=estimated)
+            try:
+                item.result = await asyncio.wait_for(self.run(agent, input, **run_kwargs), timeout)
+                item.error = None
+            except RETRYABLE_ERRORS as e:
+                item.error = e
+            except Exception as e:
+                item.error = e
+                break  # not transient, retrying would fail the same way
+
+            if item.result is not None:
+                if budget is not None:
+                    usage = item.result.context_wrapper.usage
+                    budget.settle(estimated, usage.total_tokens, extra_requests=max(usage.requests - 1, 0))
+                break
+            if item.attempts > retries:
+                break
+            # Exponential backoff with jitter so retries do not arrive in lockstep
+            await asyncio.sleep(backoff * 2 ** (item.attempts - 1) * (0.5 + random.random()))
+
+        item.seconds = time.perf_counter() - start
+        return item
+
+    async def run_batch(
+        self,
+        starting_agent: Agent,
+        inputs: Union[Iterable[Any], AsyncIterable[Any]],
+        *,
+        concurrency: int = 10,
+        ordered: bool = False,
+        timeout: Optional[float] = None,
+        retries: int = 2,
+        backoff: float = 1.0,
+        **run_kwargs: Any,
+    ) -> AsyncIterator[BatchItem]:
+        """
+        Run `starting_agent` once per input and yield a `BatchItem` per input.
+
+        Args:
+            inputs: Inputs for `Runner.run`. Only `concurrency` of them are read ahead.
+            concurrency (int): Maximum number of runs in flight.
+            ordered (bool): Yield in input order instead of completion order. Finished results
+                wait for the earlier ones, and count against `concurrency` until yielded.
+            timeout (float): Seconds allowed per attempt (None = no limit).
+            retries (int): Extra attempts for transient errors (timeouts, 429, 5xx).
+            backoff (float): Base delay in seconds between attempts.
+            **run_kwargs: Passed to `run` (context, max_turns, run_config, ...).
+        """
+        slots = asyncio.Semaphore(concurrency)
+        done: asyncio.Queue = asyncio.Queue()
+        tasks = set()
+
+        async def worker(index: int, input: Any) -> None:
+            try:
+                item = await self._run_one(index, starting_agent, input, timeout, retries, backoff, run_kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # a bug in the runner itself, still report the item
+                item = BatchItem(index=index, input=input, error=e)
+            finally:
+                if not ordered:
+                    slots.release()
+            await done.put(item)
+
+        async def producer() -> int:
+            count = 0
+            async for input in _iterate(inputs):
+                await slots.acquire()  # do not read further ahead than we can run
+                task = asyncio.create_task(worker(count, input))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                count += 1
+            return count
+
+        feeding = asyncio.create_task(producer())
+        received = 0
+        next_index = 0
+        pending: Dict[int, BatchItem] = {}
+        try:
+            while not (feeding.done() and received == feeding.result()):
+                if feeding.done():
+                    item = await done.get()
+                else:
+                    # Also wake up when the producer finishes (or fails reading the inputs)
+                    getter = asyncio.ensure_future(done.get())
+                    await asyncio.wait({getter, feeding}, return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        if feeding.exception():
+                            raise feeding.exception()
+                        continue
+                    item = getter.result()
+                received += 1
+                if not ordered:
+                    yield item
+                    continue
+                # Ordered: a result keeps its slot until it is yielded, so one slow early
+                # item cannot make the finished ones behind it pile up here
+                pending[item.index] = item
+                while next_index in pending:
+                    slots.release()
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            feeding.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+
+async def main():
+    import os
+    from dotenv import load_dotenv
+    from openai import AsyncOpenAI
+    from agents import OpenAIChatCompletionsModel, set_tracing_disabled
+
+    load_dotenv()
+    set_tracing_disabled(True)
+
+    client = AsyncOpenAI(
+        api_key=os.getenv("GEMINI_API_KEY"),
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+    )
+    agent = Agent(
+        name="Assistant",
+        instructions="Answer in one sentence.",
+        model=OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client),
+    )
+
+    # Free tier Gemini: 15 requests and 1M tokens per minute
+    runner = BatchRunner(budgets={"default": ProviderBudget(rpm=15, tpm=1_000_000)})
+    prompts = [f"Give me one fact about the number {i}." for i in range(30)]
+
+    async for item in runner.run_batch(agent, prompts, concurrency=5, timeout=30, retries=2):
+        if item.ok:
+            print(f"[{item.index}] {item.result.final_output}")
+        else:
+            print(f"[{item.index}] failed after {item.attempts} attempts: {item.error!r}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Provider Rate Budgets
+---------------------
+Free-tier providers limit both requests per minute (RPM) and tokens per minute (TPM).
+A `ProviderBudget` keeps one token bucket for each, so callers wait for capacity
+instead of firing requests that come back as 429.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` units per second up to `capacity`.
+
+    `acquire` is first-come-first-served (callers queue on a lock), so a big request
+    cannot be starved by a stream of small ones. `charge` takes units without waiting
+    and may push the bucket into debt, which later callers then wait off.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._level = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._level
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until `amount` units are available and take them. Returns seconds waited."""
+        amount = min(amount, self.capacity)  # larger requests could never fit
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return waited
+                delay = (amount - self._level) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def charge(self, amount: float) -> None:
+        """Take (or with a negative amount, give back) units without waiting."""
+        self._refill()
+        self._level = min(self.capacity, self._level - amount)
+
+    def sync(self, remaining: float, reset_seconds: float = 0.0) -> None:
+        """Trust the server: never assume more is left than its rate-limit headers say."""
+        self._refill()
+        if remaining >= 1 or reset_seconds <= 0:
+            self._level = min(self._level, remaining)
+        else:
+            # Nothing left: the bucket is empty until the server's window resets
+            self._level = min(self._level, -self.rate * reset_seconds)
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None) -> None:
+        self._refill()
+        self.rate = rate
+        if capacity is not None:
+            self.capacity = capacity
+            self._level = min(self._level, capacity)
+
+
+class ProviderBudget:
+    """
+    RPM + TPM budget for one provider (e.g. "gemini", "openrouter", "groq").
+
+    Args:
+        rpm (float): Requests per minute.
+        tpm (float): Tokens per minute (None for no token limit).
+    """
+
+    def __init__(self, rpm: float, tpm: Optional[float] = None) -> None:
+        self.requests = TokenBucket(rpm / 60.0, rpm)
+        self.tokens = TokenBucket(tpm / 60.0, tpm) if tpm else None
+
+    async def acquire(self, tokens: int = 0, requests: int = 1) -> float:
+        """Wait for one request slot and `tokens` estimated tokens. Returns seconds waited."""
+        waited = await self.requests.acquire(requests)
+        if self.tokens is not None and tokens:
+            waited += await self.tokens.acquire(tokens)
+        return waited
+
+    def settle(self, estimated_tokens: int, actual_tokens: int, extra_requests: int = 0) -> None:
+        """Correct the budget once the real usage is known."""
+        if extra_requests:
+            self.requests.charge(extra_requests)
+        if self.tokens is not None:
+            self.tokens.charge(actual_tokens - estimated_tokens)
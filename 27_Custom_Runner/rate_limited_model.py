@@ -0,0 +1,178 @@
+"""
+Rate-limited Model
+------------------
+Wraps any SDK model (`OpenAIChatCompletionsModel`, `LitellmModel`, ...) so that every
+model call first waits on the provider's RPM/TPM buckets.
+
+- Prompt tokens are estimated before the call (instructions + input + tool schemas)
+  plus the expected completion, and corrected with the real usage afterwards.
+- Callers wait first-come-first-served, so nobody starves.
+- `x-ratelimit-remaining-*` / `x-ratelimit-reset-*` response headers keep the buckets in
+  sync with what the provider really has left (hook them in with `limiter.http_client()`).
+- A 429 halves the rate and honors `retry-after`; every success slowly raises it back to the
+  configured ceiling (AIMD). Throughput settles just under the quota instead of bursting
+  into 429s and backing off again.
+"""
+
+import json
+import re
+from typing import Any, AsyncIterator, Mapping, Optional
+
+import httpx
+from openai.types.responses import ResponseCompletedEvent
+from agents import Model, ModelResponse
+
+from rate_limit import ProviderBudget
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> float:
+    """Parse reset headers like '1m30s', '6.5s', '250ms' or plain seconds."""
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return sum(float(n) * _UNITS[unit] for n, unit in _DURATION.findall(value))
+
+
+class RateLimiter(ProviderBudget):
+    """
+    A ProviderBudget that adapts to the provider's feedback.
+
+    Args:
+        rpm (float): Requests-per-minute ceiling (your quota).
+        tpm (float): Tokens-per-minute ceiling (None if the provider has no token limit).
+        min_fraction (float): Never slow down below this fraction of the ceiling.
+        recovery (float): Fraction of the ceiling regained after each successful call.
+    """
+
+    def __init__(self, rpm: float, tpm: Optional[float] = None,
+                 min_fraction: float = 0.1, recovery: float = 0.05) -> None:
+        super().__init__(rpm, tpm)
+        self.ceilings = {"requests": rpm / 60.0, "tokens": (tpm or 0) / 60.0}
+        self.min_fraction = min_fraction
+        self.recovery = recovery
+        self.rate_limited = 0
+
+    def _buckets(self):
+        yield "requests", self.requests
+        if self.tokens is not None:
+            yield "tokens", self.tokens
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Sync the buckets with x-ratelimit-remaining-* / x-ratelimit-reset-* headers."""
+        for name, bucket in self._buckets():
+            remaining = headers.get(f"x-ratelimit-remaining-{name}")
+            if remaining is None:
+                continue
+            try:
+                bucket.sync(float(remaining), parse_reset(headers.get(f"x-ratelimit-reset-{name}")))
+            except ValueError:
+                continue
+
+    def on_rate_limited(self, retry_after: float = 0.0) -> None:
+        self.rate_limited += 1
+        for name, bucket in self._buckets():
+            floor = self.ceilings[name] * self.min_fraction
+            bucket.set_rate(max(bucket.rate * 0.5, floor))
+            if retry_after:
+                bucket.sync(0, retry_after)
+
+    def on_success(self) -> None:
+        for name, bucket in self._buckets():
+            ceiling = self.ceilings[name]
+            if bucket.rate < ceiling:
+                bucket.set_rate(min(ceiling, bucket.rate + ceiling * self.recovery))
+
+    def http_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """An httpx client for AsyncOpenAI(http_client=...) that feeds headers to this limiter."""
+        async def hook(response: httpx.Response) -> None:
+            self.observe_headers(response.headers)
+
+        hooks = kwargs.pop("event_hooks", {})
+        hooks.setdefault("response", []).append(hook)
+        return httpx.AsyncClient(event_hooks=hooks, **kwargs)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    # openai.RateLimitError and litellm.RateLimitError both carry status_code = 429
+    return getattr(error, "status_code", None)
+
+
+def _retry_after(error: BaseException) -> float:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    return parse_reset(headers.get("retry-after"))
+
+
+class RateLimitedModel(Model):
+    """
+    Args:
+        model (Model): The real model.
+        limiter (RateLimiter): Shared by every model of the same provider.
+        completion_tokens (int): Expected answer size when max_tokens is not set.
+        max_retries (int): How often a 429 is retried.
+    """
+
+    def __init__(self, model: Model, limiter: RateLimiter,
+                 completion_tokens: int = 500, max_retries: int = 3) -> None:
+        self.model = model
+        self.limiter = limiter
+        self.completion_tokens = completion_tokens
+        self.max_retries = max_retries
+
+    def estimate_tokens(self, system_instructions, input, model_settings, tools) -> int:
+        chars = len(system_instructions or "") + len(json.dumps(input, default=str))
+        for tool in tools:
+            chars += len(json.dumps(getattr(tool, "params_json_schema", {}) or {}))
+        return chars // 4 + (model_settings.max_tokens or self.completion_tokens)
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, **kwargs: Any) -> ModelResponse:
+        estimated = self.estimate_tokens(system_instructions, input, model_settings, tools)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(tokens=estimated)
+            try:
+                response = await self.model.get_response(
+                    system_instructions, input, model_settings, tools,
+                    output_schema, handoffs, tracing, **kwargs,
+                )
+            except Exception as e:
+                if _status_code(e) != 429 or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.limiter.on_rate_limited(_retry_after(e))
+                continue
+            self.limiter.on_success()
+            self.limiter.settle(estimated, response.usage.total_tokens or estimated)
+            return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, **kwargs: Any) -> AsyncIterator[Any]:
+        estimated = self.estimate_tokens(system_instructions, input, model_settings, tools)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(tokens=estimated)
+            started = False
+            try:
+                async for event in self.model.stream_response(
+                    system_instructions, input, model_settings, tools,
+                    output_schema, handoffs, tracing, **kwargs,
+                ):
+                    started = True
+                    if isinstance(event, ResponseCompletedEvent) and event.response.usage:
+                        self.limiter.settle(estimated, event.response.usage.total_tokens)
+                    yield event
+            except Exception as e:
+                # Once events reached the caller the call cannot be replayed
+                if started or _status_code(e) != 429 or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.limiter.on_rate_limited(_retry_after(e))
+                continue
+            self.limiter.on_success()
+            return
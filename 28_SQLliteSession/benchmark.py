@@ -0,0 +1,72 @@
+"""
+Benchmark: SDK SQLiteSession vs WALSession (shared SessionStore) under many concurrent chats.
+Each simulated chat does a few turns of: get_items() -> add_items([user, assistant]).
+
+    python benchmark.py --sessions 200 --turns 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from agents import SQLiteSession
+
+from wal_session import SessionStore
+
+
+async def chat(session, turns: int, append_latencies: list) -> None:
+    for turn in range(turns):
+        await session.get_items()
+        items = [
+            {"role": "user", "content": f"question {turn}"},
+            {"role": "assistant", "content": f"answer {turn} " + "x" * 200},
+        ]
+        start = time.perf_counter()
+        await session.add_items(items)
+        append_latencies.append(time.perf_counter() - start)
+
+
+def report(name: str, sessions: int, elapsed: float, latencies: list) -> None:
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{name:<16}{sessions / elapsed:>14.1f}{p50:>12.2f}{p99:>12.2f}")
+
+
+async def bench_sqlite_session(db_path: str, sessions: int, turns: int) -> None:
+    latencies: list = []
+    chats = [SQLiteSession(f"user-{i}", db_path) for i in range(sessions)]
+    start = time.perf_counter()
+    await asyncio.gather(*(chat(s, turns, latencies) for s in chats))
+    report("SQLiteSession", sessions, time.perf_counter() - start, latencies)
+    for s in chats:
+        s.close()
+
+
+async def bench_wal_session(db_path: str, sessions: int, turns: int) -> None:
+    latencies: list = []
+    async with SessionStore(db_path) as store:
+        start = time.perf_counter()
+        await asyncio.gather(*(chat(store.session(f"user-{i}"), turns, latencies) for i in range(sessions)))
+        elapsed = time.perf_counter() - start
+        report("WALSession", sessions, elapsed, latencies)
+        print(f"  {store.writes} writes in {store.transactions} transactions "
+              f"({store.writes / max(store.transactions, 1):.1f} per commit)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'backend':<16}{'sessions/sec':>14}{'p50 ms':>12}{'p99 ms':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        await bench_sqlite_session(os.path.join(tmp, "sdk.db"), args.sessions, args.turns)
+        await bench_wal_session(os.path.join(tmp, "wal.db"), args.sessions, args.turns)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
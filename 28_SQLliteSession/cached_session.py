@@ -0,0 +1,204 @@
+"""
+Write-through Session Cache
+---------------------------
+Every `Runner.run(..., session=session)` starts with `session.get_items()`, which reads the
+whole conversation back from SQLite and JSON-decodes it, even though this same process
+wrote those items a moment ago.
+
+`CachedSession` wraps any session (SQLiteSession, WALSession, ...):
+
+- `get_items` is served from memory when the session is hot.
+- `add_items` / `pop_item` / `clear_session` write through to the real store first,
+  then update the cached list, so the cache never holds something the database does not.
+- All cached sessions share one `SessionCache`, an LRU bounded by the total size of
+  the cached items in bytes. Cold sessions are dropped and simply re-read on next use.
+
+The cache assumes this process is the only writer of a given session (one chat is
+served by one worker). Items returned by `get_items` are shared, treat them as read-only.
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from agents import TResponseInputItem
+from agents.memory.session import Session, SessionABC
+
+
+def _item_size(item: TResponseInputItem) -> int:
+    return len(json.dumps(item, default=str))
+
+
+@dataclass
+class _CachedHistory:
+    items: List[TResponseInputItem]
+    sizes: List[int]
+    size: int = 0
+
+
+@dataclass
+class SessionCache:
+    """
+    LRU of decoded histories, shared by all `CachedSession`s of a process.
+
+    Args:
+        max_bytes (int): Upper bound for the total size of all cached items.
+    """
+
+    max_bytes: int = 64 * 1024 * 1024
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _entries: "OrderedDict[str, _CachedHistory]" = field(default_factory=OrderedDict)
+    _bytes: int = 0
+    # Writes and cache-filling loads in flight, so a slow load can tell it raced with a write
+    _pending: Dict[str, int] = field(default_factory=dict)
+    _loads: Dict[str, List[List[bool]]] = field(default_factory=dict)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, session_id: str) -> Optional[_CachedHistory]:
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self._entries.move_to_end(session_id)
+        return entry
+
+    def begin_load(self, session_id: str) -> List[bool]:
+        token = [False]  # flipped to True by any write that overlaps the load
+        self._loads.setdefault(session_id, []).append(token)
+        return token
+
+    def end_load(self, session_id: str, token: List[bool]) -> bool:
+        """Finish a load. True if its snapshot is safe to cache."""
+        loads = self._loads[session_id]
+        loads.remove(token)
+        if not loads:
+            del self._loads[session_id]
+        return not token[0] and not self._pending.get(session_id)
+
+    def begin_write(self, session_id: str) -> None:
+        self._pending[session_id] = self._pending.get(session_id, 0) + 1
+        self._mark_loads(session_id)
+
+    def end_write(self, session_id: str) -> None:
+        self._pending[session_id] -= 1
+        if not self._pending[session_id]:
+            del self._pending[session_id]
+        self._mark_loads(session_id)
+
+    def _mark_loads(self, session_id: str) -> None:
+        for token in self._loads.get(session_id, ()):
+            token[0] = True
+
+    def put(self, session_id: str, items: List[TResponseInputItem]) -> None:
+        self.invalidate(session_id)
+        sizes = [_item_size(item) for item in items]
+        entry = _CachedHistory(list(items), sizes, sum(sizes))
+        if entry.size > self.max_bytes:
+            return
+        self._entries[session_id] = entry
+        self._bytes += entry.size
+        self._evict()
+
+    def append(self, session_id: str, items: List[TResponseInputItem]) -> None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        sizes = [_item_size(item) for item in items]
+        entry.items.extend(items)
+        entry.sizes.extend(sizes)
+        entry.size += sum(sizes)
+        self._bytes += sum(sizes)
+        self._entries.move_to_end(session_id)
+        self._evict()
+
+    def pop(self, session_id: str, expected: Optional[TResponseInputItem]) -> None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        if not entry.items or entry.items[-1] != expected:
+            # The store and the cache disagree, re-read next time
+            self.invalidate(session_id)
+            return
+        entry.items.pop()
+        size = entry.sizes.pop()
+        entry.size -= size
+        self._bytes -= size
+
+    def invalidate(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+
+class CachedSession(SessionABC):
+    """Serve `get_items` from a shared in-memory LRU, write through to `store`."""
+
+    def __init__(self, store: Session, cache: SessionCache) -> None:
+        self.session_id = store.session_id
+        self.store = store
+        self.cache = cache
+
+    async def get_items(self, limit: Optional[int] = None) -> List[TResponseInputItem]:
+        entry = self.cache.get(self.session_id)
+        if entry is not None:
+            self.cache.hits += 1
+            items = entry.items
+        else:
+            self.cache.misses += 1
+            token = self.cache.begin_load(self.session_id)
+            try:
+                items = await self.store.get_items()
+            finally:
+                safe = self.cache.end_load(self.session_id, token)
+            # Only cache the snapshot if no write overlapped the read
+            if safe:
+                self.cache.put(self.session_id, items)
+        if limit is None:
+            return list(items)
+        return list(items[-limit:]) if limit > 0 else []
+
+    async def add_items(self, items: List[TResponseInputItem]) -> None:
+        if not items:
+            return
+        self.cache.begin_write(self.session_id)
+        try:
+            await self.store.add_items(items)
+            self.cache.append(self.session_id, items)
+        except BaseException:
+            self.cache.invalidate(self.session_id)
+            raise
+        finally:
+            self.cache.end_write(self.session_id)
+
+    async def pop_item(self) -> Optional[TResponseInputItem]:
+        self.cache.begin_write(self.session_id)
+        try:
+            item = await self.store.pop_item()
+            self.cache.pop(self.session_id, item)
+            return item
+        except BaseException:
+            self.cache.invalidate(self.session_id)
+            raise
+        finally:
+            self.cache.end_write(self.session_id)
+
+    async def clear_session(self) -> None:
+        self.cache.begin_write(self.session_id)
+        try:
+            await self.store.clear_session()
+            self.cache.put(self.session_id, [])
+        except BaseException:
+            self.cache.invalidate(self.session_id)
+            raise
+        finally:
+            self.cache.end_write(self.session_id)
@@ -0,0 +1,392 @@
+"""
+High-throughput SQLite Session Store
+------------------------------------
+`SQLiteSession("123", "conversation.db")` commits every `add_items` call in its own
+write transaction. With many chats at once, those writers queue up on the same file.
+
+`SessionStore` is shared by all sessions of a process:
+
+- The database runs in WAL mode, so readers never block the writer (and vice versa).
+- Reads go to a small pool of reader connections (one per reader thread).
+- All writes go through ONE writer task. It takes every write that is waiting and
+  commits them together in a single transaction (group commit).
+- Every blocking sqlite call runs in a thread, never on the event loop.
+
+`WALSession` implements the same Session protocol as `SQLiteSession`
+(get_items / add_items / pop_item / clear_session) and uses the same tables,
+so an existing conversation.db keeps working.
+
+The message id is used as the per-session sequence number: an index on
+(session_id, id) turns "last N items" and keyset-paginated reads into bounded
+index range scans, and `iter_items()` decodes rows lazily page by page.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
+
+from agents import TResponseInputItem
+from agents.memory.session import SessionABC
+
+
+@dataclass
+class _WriteOp:
+    kind: str  # "add" | "pop" | "clear"
+    session_id: str
+    payload: List[str] = field(default_factory=list)
+    future: Optional[asyncio.Future] = None
+
+
+class SessionStore:
+    """
+    Shared SQLite backend: WAL mode, reader pool and one group-committing writer.
+
+    Args:
+        db_path (str | Path): SQLite file. In-memory databases are not supported
+            because every reader needs its own connection to the same data.
+        readers (int): Number of reader threads / connections.
+        max_batch (int): Maximum number of write operations in one transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = "conversation.db",
+        readers: int = 4,
+        max_batch: int = 512,
+        sessions_table: str = "agent_sessions",
+        messages_table: str = "agent_messages",
+    ) -> None:
+        if str(db_path) == ":memory:":
+            raise ValueError("SessionStore needs a database file, not ':memory:'")
+        self.db_path = str(db_path)
+        self.max_batch = max_batch
+        self.sessions_table = sessions_table
+        self.messages_table = messages_table
+
+        self._reader_pool = ThreadPoolExecutor(readers, thread_name_prefix="sqlite-reader")
+        self._writer_pool = ThreadPoolExecutor(1, thread_name_prefix="sqlite-writer")
+        self._local = threading.local()
+        self._reader_connections: List[sqlite3.Connection] = []
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()  # concurrent first calls start the store once
+        self._closed = False
+
+        # Counters for the benchmark / monitoring
+        self.transactions = 0
+        self.writes = 0
+
+    # ─── Lifecycle ───────────────────────────────────────────────────────────
+
+    async def start(self) -> "SessionStore":
+        async with self._start_lock:
+            if self._closed:
+                # The thread pools are shut down and cannot be restarted
+                raise RuntimeError("SessionStore is closed, create a new one")
+            if self._writer_task is None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._writer_pool, self._open_writer)  # creates the schema
+                self._queue = asyncio.Queue()
+                self._writer_task = asyncio.create_task(self._writer_loop())
+        return self
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer_task is not None:
+            await self._queue.put(None)  # flush everything queued, then stop
+            await self._writer_task
+            self._writer_task = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer_pool, self._close_writer)
+        for conn in self._reader_connections:
+            conn.close()
+        self._reader_connections.clear()
+        self._reader_pool.shutdown(wait=True)
+        self._writer_pool.shutdown(wait=True)
+
+    async def __aenter__(self) -> "SessionStore":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def session(self, session_id: str) -> "WALSession":
+        return WALSession(session_id, self)
+
+    # ─── Connections (always used from their own thread) ─────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, fsync only at checkpoints
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _open_writer(self) -> None:
+        conn = self._connect()
+        conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.sessions_table} (
+                session_id TEXT PRIMARY KEY,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS {self.messages_table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                message_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (session_id) REFERENCES {self.sessions_table} (session_id)
+                    ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS idx_{self.messages_table}_session_id
+            ON {self.messages_table} (session_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_{self.messages_table}_session_seq
+            ON {self.messages_table} (session_id, id);
+            """
+        )
+        self._writer_conn = conn
+
+    def _close_writer(self) -> None:
+        if self._writer_conn is not None:
+            self._writer_conn.close()
+            self._writer_conn = None
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+            self._reader_connections.append(conn)
+        return conn
+
+    # ─── Reads ───────────────────────────────────────────────────────────────
+
+    async def read(self, fn, *args: Any) -> Any:
+        """Run `fn(conn, *args)` on a pooled reader connection."""
+        if self._writer_task is None:
+            await self.start()  # the first call of a run is usually get_items()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader_pool, lambda: fn(self._reader(), *args))
+
+    # ─── Writes ──────────────────────────────────────────────────────────────
+
+    async def write(self, kind: str, session_id: str, payload: Optional[List[str]] = None) -> Any:
+        """Queue a write and wait until the transaction that contains it is committed."""
+        if self._writer_task is None:
+            await self.start()
+        op = _WriteOp(kind, session_id, payload or [], asyncio.get_running_loop().create_future())
+        await self._queue.put(op)
+        return await op.future
+
+    async def _writer_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            op = await self._queue.get()
+            if op is None:
+                break
+            batch = [op]
+            # Everything that arrived while the last commit was running joins this one
+            while len(batch) < self.max_batch and not self._queue.empty():
+                nxt = self._queue.get_nowait()
+                if nxt is None:
+                    stopping = True
+                    break
+                batch.append(nxt)
+
+            try:
+                results = await loop.run_in_executor(self._writer_pool, self._commit_batch, batch)
+            except Exception as e:  # the whole transaction failed
+                results = [e] * len(batch)
+
+            for op, result in zip(batch, results):
+                if op.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    op.future.set_exception(result)
+                else:
+                    op.future.set_result(result)
+
+    def _commit_batch(self, batch: List[_WriteOp]) -> List[Any]:
+        conn = self._writer_conn
+        results: List[Any] = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for op in batch:
+                # A savepoint per operation: one bad op does not roll back the others
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append(self._apply(conn, op))
+                    conn.execute("RELEASE op")
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append(e)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.transactions += 1
+        self.writes += len(batch)
+        return results
+
+    def _apply(self, conn: sqlite3.Connection, op: _WriteOp) -> Any:
+        if op.kind == "add":
+            conn.execute(
+                f"INSERT OR IGNORE INTO {self.sessions_table} (session_id) VALUES (?)",
+                (op.session_id,),
+            )
+            conn.executemany(
+                f"INSERT INTO {self.messages_table} (session_id, message_data) VALUES (?, ?)",
+                [(op.session_id, data) for data in op.payload],
+            )
+            conn.execute(
+                f"UPDATE {self.sessions_table} SET updated_at = CURRENT_TIMESTAMP WHERE session_id = ?",
+                (op.session_id,),
+            )
+            return None
+
+        if op.kind == "pop":
+            row = conn.execute(
+                f"""
+                DELETE FROM {self.messages_table}
+                WHERE id = (
+                    SELECT id FROM {self.messages_table}
+                    WHERE session_id = ?
+                    ORDER BY id DESC
+                    LIMIT 1
+                )
+                RETURNING message_data
+                """,
+                (op.session_id,),
+            ).fetchone()
+            return row[0] if row else None
+
+        if op.kind == "clear":
+            conn.execute(f"DELETE FROM {self.messages_table} WHERE session_id = ?", (op.session_id,))
+            conn.execute(f"DELETE FROM {self.sessions_table} WHERE session_id = ?", (op.session_id,))
+            return None
+
+        raise ValueError(f"Unknown write operation: {op.kind}")
+
+
+def _decode(message_data: str) -> Optional[TResponseInputItem]:
+    try:
+        return json.loads(message_data)
+    except json.JSONDecodeError:
+        return None  # skip corrupted rows, same as SQLiteSession
+
+
+class WALSession(SessionABC):
+    """A single conversation stored in a shared `SessionStore`."""
+
+    def __init__(self, session_id: str, store: SessionStore) -> None:
+        self.session_id = session_id
+        self.store = store
+
+    async def get_items(self, limit: Optional[int] = None) -> List[TResponseInputItem]:
+        """Return the latest `limit` items (or all of them) in chronological order."""
+        table = self.store.messages_table
+
+        def _get(conn: sqlite3.Connection) -> List[TResponseInputItem]:
+            if limit is None:
+                rows = conn.execute(
+                    f"SELECT message_data FROM {table} WHERE session_id = ? ORDER BY id ASC",
+                    (self.session_id,),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT message_data FROM {table} WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                    (self.session_id, limit),
+                ).fetchall()
+                rows.reverse()
+            items = (_decode(data) for (data,) in rows)
+            return [item for item in items if item is not None]
+
+        return await self.store.read(_get)
+
+    async def get_page(
+        self, limit: int, before: Optional[int] = None
+    ) -> Tuple[List[TResponseInputItem], Optional[int]]:
+        """
+        Keyset pagination, newest page first.
+
+        Args:
+            limit (int): Page size.
+            before (int): Cursor from the previous page (None for the newest page).
+
+        Returns:
+            tuple: (items in chronological order, cursor for the next older page or None).
+        """
+        rows = await self._read_rows(limit, before=before, newest_first=True)
+        rows.reverse()
+        items = [item for item in (_decode(data) for _, data in rows) if item is not None]
+        cursor = rows[0][0] if len(rows) == limit else None
+        return items, cursor
+
+    async def iter_items(
+        self, after: Optional[int] = None, page_size: int = 200
+    ) -> AsyncIterator[Tuple[int, TResponseInputItem]]:
+        """
+        Yield (seq, item) in chronological order, one page at a time.
+
+        Only one page of rows is held in memory, however long the history is.
+        Pass the last seen seq as `after` to resume.
+        """
+        while True:
+            rows = await self._read_rows(page_size, after=after)
+            for seq, data in rows:
+                item = _decode(data)
+                if item is not None:
+                    yield seq, item
+            if len(rows) < page_size:
+                return
+            after = rows[-1][0]
+
+    async def _read_rows(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> List[Tuple[int, str]]:
+        # Every query is a range scan on idx_<messages>_session_seq, bounded by LIMIT
+        table = self.store.messages_table
+        where = "session_id = ?"
+        params: List[Any] = [self.session_id]
+        if after is not None:
+            where += " AND id > ?"
+            params.append(after)
+        if before is not None:
+            where += " AND id < ?"
+            params.append(before)
+        order = "DESC" if newest_first else "ASC"
+        sql = f"SELECT id, message_data FROM {table} WHERE {where} ORDER BY id {order} LIMIT ?"
+        params.append(limit)
+
+        def _query(conn: sqlite3.Connection) -> List[Tuple[int, str]]:
+            return conn.execute(sql, params).fetchall()
+
+        return await self.store.read(_query)
+
+    async def add_items(self, items: List[TResponseInputItem]) -> None:
+        if not items:
+            return
+        await self.store.write("add", self.session_id, [json.dumps(item) for item in items])
+
+    async def pop_item(self) -> Optional[TResponseInputItem]:
+        data = await self.store.write("pop", self.session_id)
+        return _decode(data) if data is not None else None
+
+    async def clear_session(self) -> None:
+        await self.store.write("clear", self.session_id)
@@ -0,0 +1,183 @@
+"""
+Shared AsyncOpenAI Client Registry
+----------------------------------
+Almost every lesson creates its own `AsyncOpenAI(base_url=...)` at import time.
+Each of those clients owns a separate httpx connection pool, so a process that
+imports a few of them keeps several cold pools open to the same endpoint.
+
+This module hands out ONE client per (base_url, api_key) pair. All agents that
+talk to the same provider share its keep-alive pool, can multiplex requests
+over HTTP/2 and can be warmed up once at startup.
+
+httpx connections belong to the event loop that opened them, so the shared
+client keeps one pool per running loop. A script that calls `asyncio.run()`
+twice gets a fresh pool the second time instead of the dead sockets of the
+first loop.
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Each known provider reads its own key, we never send one provider's key to another
+API_KEY_ENV = {
+    GEMINI_BASE_URL: "GEMINI_API_KEY",
+    OPENROUTER_BASE_URL: "OPENROUTER_API_KEY",
+}
+
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool settings used when a client is created."""
+
+    max_connections: int = 200
+    max_keepalive_connections: int = 100
+    keepalive_expiry: float = 60.0
+    http2: bool = True
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+
+
+class _PerLoopTransport(httpx.AsyncBaseTransport):
+    """Keeps one connection pool per event loop and sends each request through the current one."""
+
+    def __init__(self, config: PoolConfig):
+        self._config = config
+        # A finished loop is garbage collected and its pool goes with it
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = httpx.AsyncHTTPTransport(
+                http2=self._config.http2 and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self._config.max_connections,
+                    max_keepalive_connections=self._config.max_keepalive_connections,
+                    keepalive_expiry=self._config.keepalive_expiry,
+                ),
+            )
+            self._pools[loop] = pool
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Only the current loop can close its own sockets
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+
+@dataclass
+class _Entry:
+    client: AsyncOpenAI
+    http_client: httpx.AsyncClient
+    base_url: str
+    config: PoolConfig
+
+
+_entries: Dict[Tuple[str, str], _Entry] = {}
+_lock = threading.Lock()
+
+
+def _normalize(base_url: str) -> str:
+    return base_url.rstrip("/") + "/"
+
+
+def _build_http_client(config: PoolConfig) -> httpx.AsyncClient:
+    return DefaultAsyncHttpxClient(
+        transport=_PerLoopTransport(config),
+        timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+    )
+
+
+def get_client(
+    base_url: str = GEMINI_BASE_URL,
+    api_key: Optional[str] = None,
+    config: Optional[PoolConfig] = None,
+) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for this provider, creating it on first use.
+
+    Args:
+        base_url (str): The OpenAI-compatible endpoint (default: Gemini).
+        api_key (str): The API key. Falls back to the provider's own variable
+            (GEMINI_API_KEY or OPENROUTER_API_KEY), other endpoints must pass it.
+        config (PoolConfig): Pool settings. Only used when the client is first created.
+
+    Returns:
+        AsyncOpenAI: The same client object for every call with the same (base_url, api_key).
+    """
+    base_url = _normalize(base_url)
+    env_var = next((var for url, var in API_KEY_ENV.items() if _normalize(url) == base_url), None)
+    api_key = api_key or (os.getenv(env_var) if env_var else None)
+    if not api_key:
+        hint = f"set {env_var} or pass api_key=..." if env_var else f"pass api_key=... for {base_url}"
+        raise ValueError(f"api_key is missing ({hint})")
+
+    key = (base_url, api_key)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            config = config or PoolConfig()
+            http_client = _build_http_client(config)
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+            entry = _Entry(client=client, http_client=http_client, base_url=base_url, config=config)
+            _entries[key] = entry
+        return entry.client
+
+
+async def warm_up(connections: int = 4, timeout: float = 5.0) -> int:
+    """
+    Open TCP/TLS connections for every registered client before real traffic arrives.
+
+    With HTTP/2 one connection is multiplexed, so a single request per client is enough.
+    With HTTP/1.1 we open `connections` sockets in parallel so they sit in the keep-alive pool.
+
+    Returns:
+        int: Number of warm-up requests that reached the server (any status code counts).
+    """
+    async def _touch(entry: _Entry) -> bool:
+        try:
+            # The status code does not matter, we only want the handshake done
+            await entry.http_client.head(entry.base_url, timeout=timeout)
+            return True
+        except httpx.HTTPError:
+            return False
+
+    with _lock:
+        entries = list(_entries.values())
+
+    tasks = []
+    for entry in entries:
+        count = 1 if entry.config.http2 and HTTP2_AVAILABLE else connections
+        tasks.extend(_touch(entry) for _ in range(count))
+
+    results = await asyncio.gather(*tasks)
+    return sum(results)
+
+
+async def close_all() -> None:
+    """Close every shared client (call once at shutdown)."""
+    with _lock:
+        entries = list(_entries.values())
+        _entries.clear()
+    await asyncio.gather(*(entry.client.close() for entry in entries))
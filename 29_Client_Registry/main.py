@@ -0,0 +1,50 @@
+# This lesson shows how many agents can share ONE pooled AsyncOpenAI client.
+# Instead of writing `Provider = AsyncOpenAI(...)` in every file, we ask the registry for it.
+import asyncio
+import time
+
+from dotenv import load_dotenv
+from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled
+
+from client_registry import PoolConfig, get_client, warm_up, close_all
+
+load_dotenv()
+set_tracing_disabled(True)
+
+# Same (base_url, api_key) -> same client object, so both models share one connection pool
+provider = get_client(config=PoolConfig(max_keepalive_connections=50))
+assert provider is get_client()
+
+model = OpenAIChatCompletionsModel(
+    model="gemini-2.0-flash",
+    openai_client=provider,
+)
+
+agent = Agent(
+    name="Assistant",
+    instructions="Answer in one short sentence.",
+    model=model,
+)
+
+
+async def main():
+    # Pay the TCP/TLS handshake once, before the first user request
+    warmed = await warm_up()
+    print(f"Warm connections: {warmed}")
+
+    questions = [f"Give me fun fact number {i} about Pakistan." for i in range(20)]
+
+    start = time.perf_counter()
+    # All 20 runs reuse the warm keep-alive connections of the shared client
+    results = await asyncio.gather(*(Runner.run(agent, q) for q in questions))
+    elapsed = time.perf_counter() - start
+
+    for result in results[:3]:
+        print("-", result.final_output)
+    print(f"\n{len(results)} runs in {elapsed:.2f}s")
+
+    await close_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
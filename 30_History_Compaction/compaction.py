@@ -0,0 +1,184 @@
+"""
+History Compaction
+------------------
+The chat UIs (05_Agent_with_Chainlit_Ui, 10_Agent_with_context, Chainlit) append every turn
+to `history` and send the whole list to `Runner.run_streamed` again. Prompt size and latency
+grow with every turn.
+
+This module keeps the input size bounded:
+
+- The last `keep_turns` turns are always sent word for word.
+- Older turns are folded into ONE rolling summary item.
+- The summary is written by a small summarizer agent in a background task, so the
+  user never waits for it. Until it is ready the older turns are still sent (trimmed
+  to the token budget), after that only the summary is.
+- Summarizing starts when the un-summarized part goes over `trigger_tokens`.
+
+`CompactingHistory` is for the plain `history` lists of the UIs, `CompactingSession`
+wraps any SDK session (SQLiteSession, WALSession, ...).
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+
+from agents import Agent, Runner, TResponseInputItem
+from agents.memory.session import Session, SessionABC
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARIZER_INSTRUCTIONS = (
+    "You compress chat history. You get an optional previous summary and new messages. "
+    "Write one updated summary that keeps names, facts, decisions, open questions and user "
+    "preferences. Be brief, use bullet points, do not add anything that was not said."
+)
+
+Summarizer = Callable[[str, List[TResponseInputItem]], Awaitable[str]]
+
+
+def estimate_tokens(items: List[TResponseInputItem]) -> int:
+    """Cheap token estimate (about 4 characters per token), good enough for budgets."""
+    chars = 0
+    for item in items:
+        content = item.get("content", item) if isinstance(item, dict) else item
+        chars += len(content) if isinstance(content, str) else len(json.dumps(content, default=str))
+    return chars // 4 + 4 * len(items)
+
+
+def split_turns(items: List[TResponseInputItem]) -> List[List[TResponseInputItem]]:
+    """Group items into turns. A turn starts at each user message."""
+    turns: List[List[TResponseInputItem]] = []
+    for item in items:
+        if not turns or (isinstance(item, dict) and item.get("role") == "user"):
+            turns.append([])
+        turns[-1].append(item)
+    return turns
+
+
+def agent_summarizer(agent: Agent) -> Summarizer:
+    """Use an Agent (e.g. a small/cheap model) as the summarizer."""
+    async def summarize(previous: str, items: List[TResponseInputItem]) -> str:
+        transcript = "\n".join(
+            f"{item.get('role', item.get('type', 'item'))}: {item.get('content', item)}"
+            for item in items if isinstance(item, dict)
+        )
+        prompt = f"Previous summary:\n{previous or '(none)'}\n\nNew messages:\n{transcript}"
+        result = await Runner.run(agent, prompt)
+        return str(result.final_output)
+    return summarize
+
+
+@dataclass
+class Compactor:
+    """
+    Decides what part of a history is sent to the model, and summarizes the rest.
+
+    Args:
+        summarizer: async (previous_summary, items) -> new summary.
+        keep_turns (int): Number of latest turns always sent verbatim.
+        trigger_tokens (int): Start summarizing when older, un-summarized turns exceed this.
+        max_tokens (int): Hard budget for the older turns while a summary is pending.
+    """
+
+    summarizer: Summarizer
+    keep_turns: int = 6
+    trigger_tokens: int = 1500
+    max_tokens: int = 3000
+    summary: str = ""
+    summarized: int = 0  # number of items already folded into `summary`
+    compactions: int = 0
+    last_error: Optional[Exception] = None
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def view(self, items: List[TResponseInputItem]) -> List[TResponseInputItem]:
+        """Return summary item + un-summarized older turns (within budget) + last turns."""
+        if self.summarized > len(items):
+            # The history was cleared or popped below what we summarized
+            self.reset()
+
+        turns = split_turns(items[self.summarized:])
+        recent = turns[-self.keep_turns:] if self.keep_turns else []
+        older = turns[:len(turns) - len(recent)]
+
+        older_items = [item for turn in older for item in turn]
+        if estimate_tokens(older_items) > self.trigger_tokens:
+            self._schedule(items, self.summarized + len(older_items))
+
+        # Until the summary catches up, drop the oldest turns that do not fit the budget
+        while older and estimate_tokens([i for t in older for i in t]) > self.max_tokens:
+            older.pop(0)
+
+        result: List[TResponseInputItem] = []
+        if self.summary:
+            result.append({"role": "system", "content": SUMMARY_PREFIX + self.summary})
+        for turn in older + recent:
+            result.extend(turn)
+        return result
+
+    def _schedule(self, items: List[TResponseInputItem], upto: int) -> None:
+        if self._task is not None and not self._task.done():
+            return  # one summary at a time, the next view() picks up the rest
+        self._task = asyncio.create_task(self._compact(list(items[self.summarized:upto]), upto))
+
+    async def _compact(self, new_items: List[TResponseInputItem], upto: int) -> None:
+        start = self.summarized
+        try:
+            summary = await self.summarizer(self.summary, new_items)
+        except Exception as e:
+            # Keep the old summary, the next view() schedules a retry
+            self.last_error = e
+            return
+        if self.summarized == start:  # ignore the result if reset() ran meanwhile
+            self.summary = summary
+            self.summarized = upto
+            self.compactions += 1
+
+    async def wait(self) -> None:
+        """Wait for a pending summary (useful in tests and at shutdown)."""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def reset(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self.summary = ""
+        self.summarized = 0
+
+
+class CompactingHistory:
+    """A `history` list for the chat UIs that only sends a bounded view to the model."""
+
+    def __init__(self, compactor: Compactor) -> None:
+        self.compactor = compactor
+        self.items: List[TResponseInputItem] = []
+
+    def append(self, item: TResponseInputItem) -> None:
+        self.items.append(item)
+
+    def for_model(self) -> List[TResponseInputItem]:
+        return self.compactor.view(self.items)
+
+
+class CompactingSession(SessionABC):
+    """Wraps a session: everything is stored, but `get_items` returns the compacted view."""
+
+    def __init__(self, store: Session, compactor: Compactor) -> None:
+        self.session_id = store.session_id
+        self.store = store
+        self.compactor = compactor
+
+    async def get_items(self, limit: Optional[int] = None) -> List[TResponseInputItem]:
+        items = self.compactor.view(await self.store.get_items())
+        return items[-limit:] if limit else items
+
+    async def add_items(self, items: List[TResponseInputItem]) -> None:
+        await self.store.add_items(items)
+
+    async def pop_item(self) -> Optional[TResponseInputItem]:
+        return await self.store.pop_item()
+
+    async def clear_session(self) -> None:
+        self.compactor.reset()
+        await self.store.clear_session()
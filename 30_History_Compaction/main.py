@@ -0,0 +1,76 @@
+# This lesson keeps the prompt small in long chats.
+# Old turns are folded into a summary in the background, the last few turns are sent as they are.
+import asyncio
+import os
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled
+
+from compaction import (
+    SUMMARIZER_INSTRUCTIONS,
+    Compactor,
+    CompactingHistory,
+    agent_summarizer,
+    estimate_tokens,
+)
+
+load_dotenv()
+set_tracing_disabled(True)
+
+provider = AsyncOpenAI(
+    api_key=os.getenv("GEMINI_API_KEY"),
+    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+)
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=provider)
+
+agent = Agent(
+    name="Assistant",
+    instructions="You are a helpful assistant. Answer in two or three sentences.",
+    model=model,
+)
+
+# A second, cheap agent only writes the rolling summary
+summarizer_agent = Agent(
+    name="Summarizer",
+    instructions=SUMMARIZER_INSTRUCTIONS,
+    model=model,
+)
+
+
+async def main():
+    compactor = Compactor(
+        summarizer=agent_summarizer(summarizer_agent),
+        keep_turns=4,         # always send the last 4 turns word for word
+        trigger_tokens=400,   # summarize older turns once they grow past ~400 tokens
+        max_tokens=800,       # never send more than ~800 tokens of older turns
+    )
+    history = CompactingHistory(compactor)
+
+    questions = [
+        "My name is Mustafa and I am learning the OpenAI Agents SDK.",
+        "What is an Agent?",
+        "What does the Runner do?",
+        "Explain handoffs.",
+        "What are guardrails?",
+        "What is tracing?",
+        "How do sessions work?",
+        "What was my name again, and what am I learning?",
+    ]
+
+    for question in questions:
+        history.append({"role": "user", "content": question})
+        model_input = history.for_model()
+
+        result = await Runner.run(agent, model_input)
+        history.append({"role": "assistant", "content": str(result.final_output)})
+
+        print(f"\nUser: {question}\nBot: {result.final_output}")
+        print(f"[full history ~{estimate_tokens(history.items)} tokens | "
+              f"sent ~{estimate_tokens(model_input)} tokens | summaries: {compactor.compactions}]")
+
+    await compactor.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
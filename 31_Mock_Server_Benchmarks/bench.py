@@ -0,0 +1,303 @@
+# Offline latency / throughput benchmark for the patterns used in this repo.
+# Every scenario runs against the local mock server, so the numbers show the Runner itself.
+#
+#   python bench.py                                   # all scenarios
+#   python bench.py --scenarios plain tools --runs 200 --concurrency 20
+#   python bench.py --json today.json --baseline yesterday.json   # fail on regressions
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    Model,
+    ModelSettings,
+    OpenAIChatCompletionsModel,
+    Runner,
+    SQLiteSession,
+    function_tool,
+    input_guardrail,
+    set_tracing_disabled,
+)
+
+from mock_server import MockConfig, start_in_background
+
+set_tracing_disabled(True)
+
+# (start, end) of every model call made by the current run, shared with its child tasks
+_model_intervals: ContextVar[Optional[List[Tuple[float, float]]]] = ContextVar(
+    "_model_intervals", default=None
+)
+
+
+class TimedModel(Model):
+    """Wraps a model and records when each model call starts and ends."""
+
+    def __init__(self, inner: Model) -> None:
+        self.inner = inner
+        self.calls = 0
+
+    def _record(self, start: float) -> None:
+        self.calls += 1
+        intervals = _model_intervals.get()
+        if intervals is not None:
+            intervals.append((start, time.perf_counter()))
+
+    async def get_response(self, *args: Any, **kwargs: Any):
+        start = time.perf_counter()
+        try:
+            return await self.inner.get_response(*args, **kwargs)
+        finally:
+            self._record(start)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        start = time.perf_counter()
+        try:
+            async for event in self.inner.stream_response(*args, **kwargs):
+                yield event
+        finally:
+            self._record(start)
+
+
+def _covered(intervals: List[Tuple[float, float]]) -> float:
+    """Wall-clock time covered by at least one interval (parallel calls count once)."""
+    total, end = 0.0, float("-inf")
+    for start, stop in sorted(intervals):
+        if stop <= end:
+            continue
+        total += stop - max(start, end)
+        end = stop
+    return total
+
+
+# ─── Scenarios (one per lesson) ──────────────────────────────────────────────────
+
+class MathHomeworkOutput(BaseModel):
+    is_math_homework: bool
+    reasoning: str
+
+
+@function_tool
+def get_weather(city: str) -> str:
+    """Return the weather for a city."""
+    return f"The weather in {city} is sunny."
+
+
+Scenario = Callable[[int], Awaitable[None]]
+
+
+def build_scenarios(model: Model) -> Dict[str, Scenario]:
+    assistant = Agent(name="Assistant", instructions="You are a helpful assistant", model=model)
+
+    weather_agent = Agent(
+        name="Weather", instructions="Use the tool to answer.", tools=[get_weather], model=model
+    )
+
+    translators = [
+        Agent(name=f"{lang}_agent", instructions=f"Translate to {lang}", model=model)
+        for lang in ("spanish", "french", "italian")
+    ]
+    orchestrator = Agent(
+        name="orchestrator_agent",
+        instructions="Use the tools to translate.",
+        tools=[a.as_tool(tool_name=f"translate_{a.name}", tool_description=a.name) for a in translators],
+        model=model,
+        model_settings=ModelSettings(extra_headers={"x-mock-tool-calls": "all"}),
+    )
+
+    spanish = Agent(name="Spanish", instructions="Answer in Spanish.", model=model)
+    english = Agent(name="English", instructions="Answer in English.", model=model)
+    triage = Agent(name="Triage", instructions="Hand off by language.", handoffs=[spanish, english], model=model)
+
+    guardrail_agent = Agent(
+        name="Math Homework Check",
+        instructions="Check if the user input is asking for math homework help.",
+        output_type=MathHomeworkOutput,
+        model=model,
+    )
+
+    @input_guardrail
+    async def math_homework_guardrail(ctx, agent, input_data):
+        result = await Runner.run(guardrail_agent, input_data, context=ctx.context)
+        return GuardrailFunctionOutput(
+            output_info=result.final_output,
+            tripwire_triggered=result.final_output.is_math_homework,
+        )
+
+    support = Agent(
+        name="Customer Support Agent",
+        instructions="Help the user.",
+        input_guardrails=[math_homework_guardrail],
+        model=model,
+    )
+
+    async def plain(i: int) -> None:  # 00_Start_OpenAi_Agent
+        await Runner.run(assistant, "Tell me about Pak Army.")
+
+    async def streaming(i: int) -> None:  # 08_Agent_Streaming_code
+        result = Runner.run_streamed(assistant, "Please tell me 5 jokes.")
+        async for _ in result.stream_events():
+            pass
+
+    async def tools(i: int) -> None:  # 16_Tools
+        await Runner.run(weather_agent, "What is the weather in Karachi?")
+
+    async def agents_as_tools(i: int) -> None:  # 17_Agent_as_Tools
+        await Runner.run(orchestrator, "Translate 'hello' to Spanish, French and Italian.")
+
+    async def handoffs(i: int) -> None:  # 19 / 21 handoffs
+        await Runner.run(triage, "Hola, ¿cómo estás?")
+
+    async def guardrails(i: int) -> None:  # 23_Guardrails
+        await Runner.run(support, "How can I reset my password?")
+
+    async def sessions(i: int) -> None:  # 28_SQLliteSession
+        session = SQLiteSession(f"user-{i}")
+        try:
+            for turn in range(3):
+                await Runner.run(assistant, f"Message {turn}", session=session)
+        finally:
+            session.close()
+
+    return {
+        "plain": plain,
+        "streaming": streaming,
+        "tools": tools,
+        "agents_as_tools": agents_as_tools,
+        "handoffs": handoffs,
+        "guardrails": guardrails,
+        "sessions": sessions,
+    }
+
+
+# ─── Measuring ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class Result:
+    scenario: str
+    runs: int
+    runs_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    model_calls_per_run: float
+    overhead_ms_per_turn: float
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def measure(name: str, scenario: Scenario, timed: TimedModel, runs: int, concurrency: int) -> Result:
+    for i in range(3):  # warm up connections and caches
+        await scenario(i)
+
+    timed.calls = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    overheads: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            intervals: List[Tuple[float, float]] = []
+            _model_intervals.set(intervals)
+            start = time.perf_counter()
+            await scenario(i)
+            latency = time.perf_counter() - start
+            latencies.append(latency)
+            # Everything outside a model call is framework (and tool) overhead
+            overheads.append(max(latency - _covered(intervals), 0.0))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    elapsed = time.perf_counter() - start
+
+    return Result(
+        scenario=name,
+        runs=runs,
+        runs_per_sec=runs / elapsed,
+        p50_ms=statistics.median(latencies) * 1000,
+        p99_ms=_percentile(latencies, 0.99) * 1000,
+        model_calls_per_run=timed.calls / runs,
+        overhead_ms_per_turn=sum(overheads) / max(timed.calls, 1) * 1000,
+    )
+
+
+def compare(results: List[Result], baseline_path: str, tolerance: float) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = {r["scenario"]: r for r in json.load(f)}
+    regressions = []
+    for r in results:
+        old = baseline.get(r.scenario)
+        if old is None:
+            continue
+        if r.runs_per_sec < old["runs_per_sec"] * (1 - tolerance):
+            regressions.append(f"{r.scenario}: runs/sec {old['runs_per_sec']:.1f} -> {r.runs_per_sec:.1f}")
+        if r.p99_ms > old["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{r.scenario}: p99 {old['p99_ms']:.1f}ms -> {r.p99_ms:.1f}ms")
+        if r.overhead_ms_per_turn > old["overhead_ms_per_turn"] * (1 + tolerance):
+            regressions.append(
+                f"{r.scenario}: overhead {old['overhead_ms_per_turn']:.2f}ms -> {r.overhead_ms_per_turn:.2f}ms"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> List[Result]:
+    process, base_url = start_in_background(MockConfig(args.ttft, args.tps, args.reply_tokens))
+    client = AsyncOpenAI(base_url=base_url, api_key="mock")
+    timed = TimedModel(OpenAIChatCompletionsModel(model="mock", openai_client=client))
+    scenarios = build_scenarios(timed)
+
+    results = []
+    try:
+        for name in args.scenarios or scenarios:
+            results.append(await measure(name, scenarios[name], timed, args.runs, args.concurrency))
+    finally:
+        await client.close()
+        process.terminate()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for Runner scenarios")
+    parser.add_argument("--scenarios", nargs="*", help="default: all")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--ttft", type=float, default=0.05, help="mock time to first token (s)")
+    parser.add_argument("--tps", type=float, default=500.0, help="mock tokens/sec, 0 = instant")
+    parser.add_argument("--reply-tokens", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare with an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"{'scenario':<18}{'runs/s':>9}{'p50 ms':>10}{'p99 ms':>10}{'calls/run':>11}{'overhead ms/turn':>18}")
+    for r in results:
+        print(f"{r.scenario:<18}{r.runs_per_sec:>9.1f}{r.p50_ms:>10.1f}{r.p99_ms:>10.1f}"
+              f"{r.model_calls_per_run:>11.1f}{r.overhead_ms_per_turn:>18.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
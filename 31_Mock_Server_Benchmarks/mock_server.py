@@ -0,0 +1,266 @@
+"""
+Offline Mock Model Server
+-------------------------
+A local, OpenAI-compatible `/v1/chat/completions` endpoint, so every example can run
+without a Gemini / OpenRouter / Groq key.
+
+It supports:
+- plain and streaming (SSE) chat completions
+- tool calls (function tools, handoffs and agents-as-tools are all tools for the model)
+- structured outputs (`response_format` with a JSON schema)
+- a configurable time-to-first-token and token rate, so latency looks realistic
+
+How the mock answers:
+1. If tools are offered and no tool result came back since the last user message,
+   it calls the first tool (or every tool when the `x-mock-tool-calls: all` header is set).
+2. Otherwise, if a JSON schema is requested, it returns a minimal valid JSON object.
+3. Otherwise it returns `reply_tokens` words of text.
+
+Per-request overrides (e.g. via `ModelSettings(extra_headers=...)`):
+`x-mock-ttft`, `x-mock-tps`, `x-mock-reply-tokens`, `x-mock-tool-calls` (first | all | none).
+
+    python mock_server.py --port 8787 --ttft 0.2 --tps 100
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+@dataclass
+class MockConfig:
+    ttft: float = 0.1  # seconds before the first token
+    tokens_per_second: float = 200.0  # 0 means "as fast as possible"
+    reply_tokens: int = 40
+
+
+# ─── Fake content ────────────────────────────────────────────────────────────────
+
+WORDS = "the agent answered your question with a short and helpful mock reply".split()
+
+
+def _fake_text(tokens: int) -> List[str]:
+    return [WORDS[i % len(WORDS)] + " " for i in range(tokens)]
+
+
+def _schema_value(schema: Dict[str, Any], defs: Dict[str, Any]) -> Any:
+    """Build the smallest value that matches a JSON schema (enough for strict schemas)."""
+    if "$ref" in schema:
+        return _schema_value(defs[schema["$ref"].split("/")[-1]], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            return _schema_value(schema[key][0], defs)
+
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {name: _schema_value(sub, defs) for name, sub in props.items()}
+    if kind == "array":
+        return [_schema_value(schema.get("items", {"type": "string"}), defs)]
+    if kind == "string":
+        return "mock"
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return False  # guardrail verdicts stay "not tripped"
+    return None
+
+
+def _json_for(schema: Dict[str, Any]) -> str:
+    return json.dumps(_schema_value(schema, schema.get("$defs", {})))
+
+
+# ─── Deciding what to answer ─────────────────────────────────────────────────────
+
+def _plan(body: Dict[str, Any], tool_mode: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return (tool_calls, json_text). Both empty/None means a plain text answer."""
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+
+    last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+    answered = any(m.get("role") == "tool" for m in messages[last_user + 1:])
+
+    if tools and not answered and tool_mode != "none" and body.get("tool_choice") != "none":
+        chosen = tools if tool_mode == "all" else tools[:1]
+        calls = []
+        for tool in chosen:
+            fn = tool["function"]
+            args = _json_for(fn.get("parameters") or {"type": "object"})
+            calls.append({
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": fn["name"], "arguments": args},
+            })
+        return calls, None
+
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return [], _json_for(response_format["json_schema"].get("schema", {}))
+    return [], None
+
+
+def _usage(body: Dict[str, Any], completion_tokens: int) -> Dict[str, int]:
+    prompt_tokens = len(json.dumps(body.get("messages", []))) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+# ─── HTTP handlers ───────────────────────────────────────────────────────────────
+
+async def chat_completions(request: Request):
+    config: MockConfig = request.app.state.config
+    body = await request.json()
+    headers = request.headers
+    ttft = float(headers.get("x-mock-ttft", config.ttft))
+    tps = float(headers.get("x-mock-tps", config.tokens_per_second))
+    reply_tokens = int(headers.get("x-mock-reply-tokens", config.reply_tokens))
+    tool_calls, json_text = _plan(body, headers.get("x-mock-tool-calls", "first"))
+
+    if tool_calls:
+        pieces: List[str] = []
+        completion_tokens = sum(len(c["function"]["arguments"]) // 4 + 1 for c in tool_calls)
+    elif json_text is not None:
+        pieces = [json_text]
+        completion_tokens = len(json_text) // 4 + 1
+    else:
+        pieces = _fake_text(reply_tokens)
+        completion_tokens = reply_tokens
+
+    request.app.state.requests += 1
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:16]}"
+    created = int(time.time())
+    model = body.get("model", "mock")
+    finish_reason = "tool_calls" if tool_calls else "stop"
+    usage = _usage(body, completion_tokens)
+
+    if body.get("stream"):
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            return "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }) + "\n\n"
+
+        async def events():
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in pieces:
+                yield chunk({"content": piece})
+                if tps > 0:
+                    await asyncio.sleep(1 / tps)
+            for index, call in enumerate(tool_calls):
+                yield chunk({"tool_calls": [{"index": index, **call}]})
+            yield chunk({}, finish_reason)
+            if include_usage:
+                yield "data: " + json.dumps({
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage,
+                }) + "\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    await asyncio.sleep(ttft + (completion_tokens / tps if tps > 0 else 0))
+    message: Dict[str, Any] = {"role": "assistant", "content": None if tool_calls else "".join(pieces)}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return JSONResponse({
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": usage,
+    })
+
+
+async def stats(request: Request):
+    return JSONResponse({"requests": request.app.state.requests})
+
+
+def create_app(config: Optional[MockConfig] = None) -> Starlette:
+    app = Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/chat/completions", chat_completions, methods=["POST"]),
+        Route("/stats", stats),
+    ])
+    app.state.config = config or MockConfig()
+    app.state.requests = 0
+    return app
+
+
+# ─── Running the server ──────────────────────────────────────────────────────────
+
+def serve(config: MockConfig, host: str = "127.0.0.1", port: int = 8787) -> None:
+    uvicorn.run(create_app(config), host=host, port=port, log_level="warning")
+
+
+def start_in_background(config: Optional[MockConfig] = None) -> Tuple[multiprocessing.Process, str]:
+    """Start the server in its own process and return (process, base_url)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = multiprocessing.Process(target=serve, args=(config or MockConfig(), "127.0.0.1", port), daemon=True)
+    process.start()
+
+    # Wait until it accepts connections
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    else:
+        process.terminate()
+        raise RuntimeError("mock server did not start")
+    return process, f"http://127.0.0.1:{port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock model server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--ttft", type=float, default=0.1, help="time to first token (s)")
+    parser.add_argument("--tps", type=float, default=200.0, help="tokens per second, 0 = instant")
+    parser.add_argument("--reply-tokens", type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"Mock server on http://{args.host}:{args.port}/v1")
+    serve(MockConfig(args.ttft, args.tps, args.reply_tokens), args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
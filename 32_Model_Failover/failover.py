@@ -0,0 +1,227 @@
+"""
+Failover Model
+--------------
+One `Model` backed by several providers (Gemini, OpenRouter, Groq via LiteLLM, ...).
+
+- Backends are tried fastest-healthy-first (EWMA latency); errors and timeouts fail over
+  to the next one.
+- With `hedge=True`, when the current backend is slower than its own p95 latency, the same
+  request is also sent to the next backend. The first answer wins and the loser is cancelled.
+- A backend that fails `failure_threshold` times in a row is skipped for `cooldown` seconds.
+  If every backend is cooling down they are still tried, so a call never fails without trying.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from agents import Model, ModelResponse
+
+_END = object()  # end of a pumped stream
+
+
+@dataclass
+class Backend:
+    """
+    Args:
+        name (str): Shown in stats, e.g. "gemini".
+        model (Model): The provider's model.
+        timeout (float): Seconds before the call counts as failed (to first event when streaming).
+        alpha (float): Weight of the newest sample in the EWMA latency.
+    """
+
+    name: str
+    model: Model
+    timeout: Optional[float] = 30.0
+    alpha: float = 0.2
+
+    ewma: Optional[float] = None
+    calls: int = 0
+    errors: int = 0
+    wins: int = 0
+    consecutive_failures: int = 0
+    down_until: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def p95(self, min_samples: int = 20) -> Optional[float]:
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def record_success(self, latency: float) -> None:
+        self.wins += 1
+        self.consecutive_failures = 0
+        self.latencies.append(latency)
+        self.ewma = latency if self.ewma is None else self.alpha * latency + (1 - self.alpha) * self.ewma
+
+    def record_failure(self, threshold: int, cooldown: float) -> None:
+        self.errors += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= threshold:
+            self.down_until = time.monotonic() + cooldown
+
+
+class FailoverModel(Model):
+    """
+    Args:
+        backends (list): Backends in preference order (used until latencies are known).
+        hedge (bool): Send a second request when the first one is slower than usual.
+        hedge_after (float): Fixed hedge delay in seconds; by default each backend's p95.
+        failure_threshold (int): Consecutive failures before a backend cools down.
+        cooldown (float): Seconds an unhealthy backend is skipped.
+    """
+
+    def __init__(
+        self,
+        backends: List[Backend],
+        hedge: bool = False,
+        hedge_after: Optional[float] = None,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+    ) -> None:
+        if not backends:
+            raise ValueError("FailoverModel needs at least one backend")
+        self.backends = backends
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hedges = 0
+
+    def route(self) -> List[Backend]:
+        """Healthy backends, fastest first; backends without samples yet go first so they get measured."""
+        healthy = [b for b in self.backends if b.healthy]
+        cooling = [b for b in self.backends if not b.healthy]
+        healthy.sort(key=lambda b: b.ewma or 0.0)  # stable: ties keep the configured order
+        cooling.sort(key=lambda b: b.down_until)
+        return healthy + cooling
+
+    def _hedge_delay(self, backend: Backend) -> Optional[float]:
+        if not self.hedge:
+            return None
+        return self.hedge_after if self.hedge_after is not None else backend.p95()
+
+    async def _race(self, start: Callable[[Backend], "asyncio.Future[Any]"]) -> Tuple[Backend, Any, Dict]:
+        """
+        Run `start(backend)` on backends in route order until one succeeds.
+
+        Moves on to the next backend when the current one fails, or (when hedging) when it is
+        slower than its hedge delay. Returns (winner, result, losers) with losers still running.
+        """
+        order = self.route()
+        running: Dict[asyncio.Future, Tuple[Backend, float]] = {}
+        last_error: Optional[BaseException] = None
+        next_index = 0
+
+        def launch() -> Backend:
+            nonlocal next_index
+            backend = order[next_index]
+            next_index += 1
+            backend.calls += 1
+            running[asyncio.ensure_future(start(backend))] = (backend, time.perf_counter())
+            return backend
+
+        try:
+            newest = launch()
+            while running:
+                delay = self._hedge_delay(newest) if next_index < len(order) else None
+                done, _ = await asyncio.wait(running, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.hedges += 1
+                    newest = launch()
+                    continue
+                for task in done:
+                    backend, started = running.pop(task)
+                    if task.exception() is None:
+                        backend.record_success(time.perf_counter() - started)
+                        return backend, task.result(), running
+                    last_error = task.exception()
+                    backend.record_failure(self.failure_threshold, self.cooldown)
+                if not running and next_index < len(order):
+                    newest = launch()
+        except BaseException:
+            for task in running:
+                task.cancel()
+            raise
+        raise last_error
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        def start(backend: Backend):
+            return asyncio.wait_for(backend.model.get_response(*args, **kwargs), backend.timeout)
+
+        _, response, losers = await self._race(start)
+        for task in losers:
+            task.cancel()
+        return response
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        # Streams race on their first event; after that we are committed to the winner.
+        # Each stream is consumed by its own pump task from start to end (the SDK opens a
+        # tracing span inside the generator, which must be closed in the task that opened it).
+        pumps: Dict[int, Tuple[asyncio.Task, asyncio.Queue]] = {}
+
+        async def pump(backend: Backend, queue: asyncio.Queue) -> None:
+            try:
+                async for event in backend.model.stream_response(*args, **kwargs):
+                    queue.put_nowait(event)
+            except Exception as e:
+                queue.put_nowait(e)
+            queue.put_nowait(_END)
+
+        async def first_event(backend: Backend) -> Any:
+            task, queue = pumps[id(backend)]
+            try:
+                event = await asyncio.wait_for(queue.get(), backend.timeout)
+            except BaseException:
+                task.cancel()
+                raise
+            if isinstance(event, Exception):
+                raise event
+            if event is _END:
+                raise RuntimeError(f"{backend.name} returned an empty stream")
+            return event
+
+        def start(backend: Backend):
+            queue: asyncio.Queue = asyncio.Queue()
+            pumps[id(backend)] = (asyncio.create_task(pump(backend, queue)), queue)
+            return first_event(backend)
+
+        try:
+            winner, first, losers = await self._race(start)
+            for task in losers:
+                task.cancel()
+            for key, (task, _) in pumps.items():
+                if key != id(winner):
+                    task.cancel()
+
+            yield first
+            _, queue = pumps[id(winner)]
+            while (event := await queue.get()) is not _END:
+                if isinstance(event, Exception):
+                    winner.record_failure(self.failure_threshold, self.cooldown)
+                    raise event
+                yield event
+        finally:
+            for task, _ in pumps.values():
+                task.cancel()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": b.name,
+                "healthy": b.healthy,
+                "ewma_ms": round(b.ewma * 1000, 1) if b.ewma is not None else None,
+                "p95_ms": round(b.p95() * 1000, 1) if b.p95() is not None else None,
+                "calls": b.calls,
+                "wins": b.wins,
+                "errors": b.errors,
+            }
+            for b in self.backends
+        ]
@@ -0,0 +1,61 @@
+# One agent, three providers. A slow or failing provider no longer sets our tail latency:
+# errors fail over to the next provider, and slow calls are hedged on a second one.
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled
+from agents.extensions.models.litellm_model import LitellmModel
+
+from failover import Backend, FailoverModel
+
+load_dotenv()
+set_tracing_disabled(True)
+
+gemini = OpenAIChatCompletionsModel(
+    model="gemini-2.0-flash",
+    openai_client=AsyncOpenAI(
+        api_key=os.getenv("GEMINI_API_KEY"),
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+    ),
+)
+openrouter = OpenAIChatCompletionsModel(
+    model="deepseek/deepseek-chat-v3-0324:free",
+    openai_client=AsyncOpenAI(
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        base_url="https://openrouter.ai/api/v1",
+    ),
+)
+groq = LitellmModel(model="groq/llama-3.1-8b-instant", api_key=os.getenv("GROQ_API_KEY"))
+
+model = FailoverModel(
+    [
+        Backend("gemini", gemini, timeout=20),
+        Backend("openrouter", openrouter, timeout=30),
+        Backend("groq", groq, timeout=20),
+    ],
+    hedge=True,  # after a backend's p95 latency, also ask the next one
+)
+
+agent = Agent(
+    name="Assistant",
+    instructions="Answer in one sentence.",
+    model=model,
+)
+
+
+async def main():
+    for i in range(30):
+        start = time.perf_counter()
+        result = await Runner.run(agent, f"Give me one fact about the number {i}.")
+        print(f"{time.perf_counter() - start:5.2f}s  {result.final_output}")
+
+    print(f"\nhedged requests: {model.hedges}")
+    for row in model.stats():
+        print(row)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+# Classification at temperature 0 gives the same answer for the same text, so we ask only once.
+# Run this file twice: the second run answers every ticket from response_cache.db.
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from openai import AsyncOpenAI
+from agents import Agent, Runner, ModelSettings, OpenAIChatCompletionsModel, set_tracing_disabled
+
+from response_cache import CachedModel, DiskStore
+
+load_dotenv()
+set_tracing_disabled(True)
+
+provider = AsyncOpenAI(
+    api_key=os.getenv("GEMINI_API_KEY"),
+    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+)
+model = CachedModel(
+    OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=provider),
+    store=DiskStore("response_cache.db", ttl=24 * 3600),
+)
+
+
+class Ticket(BaseModel):
+    category: str  # billing | bug | feature | other
+    urgent: bool
+
+
+classifier = Agent(
+    name="Ticket Classifier",
+    instructions="Classify the support ticket as billing, bug, feature or other, and say if it is urgent.",
+    model=model,
+    model_settings=ModelSettings(temperature=0),  # deterministic -> cacheable
+    output_type=Ticket,
+)
+
+tickets = [
+    "I was charged twice this month!",
+    "The app crashes when I upload a photo.",
+    "Please add a dark mode.",
+    "I was charged twice this month!",  # repeat traffic
+    "The app crashes when I upload a photo.",
+]
+
+
+async def main():
+    for text in tickets:
+        start = time.perf_counter()
+        result = await Runner.run(classifier, text)
+        print(f"{time.perf_counter() - start:6.3f}s  {result.final_output}  <- {text}")
+
+    # Streaming hits are replayed as normal stream events
+    result = Runner.run_streamed(classifier, tickets[0])
+    async for _ in result.stream_events():
+        pass
+    print("streamed:", result.final_output)
+
+    print(model.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
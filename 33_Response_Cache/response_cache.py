@@ -0,0 +1,303 @@
+"""
+Response Cache
+--------------
+`CachedModel` wraps a model and remembers its answers. When the same request comes again
+(same model, instructions, input, tools, output type and ModelSettings), the stored
+`ModelResponse` is returned without calling the provider at all.
+
+- The key is a SHA-256 of the canonical (sorted-keys) JSON of the whole request.
+- `MemoryStore` is an in-process LRU; `DiskStore` keeps answers in SQLite across restarts.
+- Streaming calls are replayed as synthetic stream events, so `run_streamed` UIs still
+  see text deltas, tool calls and a final `response.completed` event.
+- By default only deterministic calls (temperature 0) are cached; pass `cache_if=` to change it.
+- A cache hit reports zero token usage: nothing was spent.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from pydantic import BaseModel, TypeAdapter
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseContentPartAddedEvent,
+    ResponseContentPartDoneEvent,
+    ResponseCreatedEvent,
+    ResponseFunctionCallArgumentsDeltaEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputItem,
+    ResponseOutputItemAddedEvent,
+    ResponseOutputItemDoneEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+from agents import FunctionTool, Model, ModelResponse, ModelSettings, Usage
+
+_output_items = TypeAdapter(List[ResponseOutputItem])
+
+
+# ─── Keys ────────────────────────────────────────────────────────────────────────
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    return str(value)
+
+
+def _tool_spec(tool: Any) -> Dict[str, Any]:
+    if isinstance(tool, FunctionTool):
+        return {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": tool.params_json_schema,
+            "strict": tool.strict_json_schema,
+        }
+    return {"type": type(tool).__name__, "name": getattr(tool, "name", None)}
+
+
+def request_key(model_name: str, system_instructions, input, model_settings: ModelSettings,
+                tools, output_schema, handoffs, prompt: Any = None) -> str:
+    """SHA-256 over everything that can change the model's answer."""
+    request = {
+        "model": model_name,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": model_settings.to_json_dict(),
+        "tools": [_tool_spec(t) for t in tools],
+        "output": None if output_schema is None or output_schema.is_plain_text() else {
+            "name": output_schema.name(),
+            "schema": output_schema.json_schema(),
+            "strict": output_schema.is_strict_json_schema(),
+        },
+        "handoffs": [
+            {"name": h.tool_name, "description": h.tool_description, "schema": h.input_json_schema}
+            for h in handoffs
+        ],
+        "prompt": prompt,
+    }
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=_jsonable)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def deterministic(model_settings: ModelSettings) -> bool:
+    return model_settings.temperature == 0
+
+
+# ─── Stores ──────────────────────────────────────────────────────────────────────
+
+class MemoryStore:
+    """In-process LRU of up to `max_entries` responses."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class DiskStore:
+    """
+    Responses stored as JSON in a SQLite file.
+
+    Args:
+        db_path (str): SQLite file (created if missing).
+        ttl (float): Seconds an answer stays valid (None = forever).
+    """
+
+    def __init__(self, db_path: Union[str, Path] = "response_cache.db", ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, entry TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT entry, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return None
+        return json.loads(row[0])
+
+    def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, entry, created) VALUES (?, ?, ?)",
+                (key, json.dumps(entry), time.time()),
+            )
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def clear(self) -> None:
+        def _clear() -> None:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+        await asyncio.to_thread(_clear)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ─── Replaying a response as stream events ───────────────────────────────────────
+
+def _response(model_name: str, output: List[Any]) -> Response:
+    return Response(
+        id="__cached__",
+        created_at=time.time(),
+        model=model_name,
+        object="response",
+        output=output,
+        tool_choice="auto",
+        tools=[],
+        parallel_tool_calls=False,
+    )
+
+
+def replay_events(model_name: str, output: List[Any], chunk_chars: int = 64) -> List[Any]:
+    """The stream events a live model would have sent for `output`."""
+    events: List[Any] = []
+
+    def add(event_type, **fields: Any) -> None:
+        events.append(event_type(sequence_number=len(events), **fields))
+
+    add(ResponseCreatedEvent, response=_response(model_name, []), type="response.created")
+    for index, item in enumerate(output):
+        add(ResponseOutputItemAddedEvent, item=item, output_index=index, type="response.output_item.added")
+        if isinstance(item, ResponseOutputMessage):
+            for part_index, part in enumerate(item.content):
+                add(ResponseContentPartAddedEvent, content_index=part_index, item_id=item.id,
+                    output_index=index, type="response.content_part.added",
+                    part=ResponseOutputText(text="", type="output_text", annotations=[])
+                    if isinstance(part, ResponseOutputText) else part)
+                if isinstance(part, ResponseOutputText):
+                    for start in range(0, len(part.text), chunk_chars):
+                        add(ResponseTextDeltaEvent, content_index=part_index, item_id=item.id,
+                            output_index=index, delta=part.text[start:start + chunk_chars],
+                            logprobs=[], type="response.output_text.delta")
+                add(ResponseContentPartDoneEvent, content_index=part_index, item_id=item.id,
+                    output_index=index, part=part, type="response.content_part.done")
+        elif isinstance(item, ResponseFunctionToolCall):
+            add(ResponseFunctionCallArgumentsDeltaEvent, delta=item.arguments, item_id=item.id or "",
+                output_index=index, type="response.function_call_arguments.delta")
+        add(ResponseOutputItemDoneEvent, item=item, output_index=index, type="response.output_item.done")
+    add(ResponseCompletedEvent, response=_response(model_name, list(output)), type="response.completed")
+    return events
+
+
+# ─── The model wrapper ───────────────────────────────────────────────────────────
+
+class CachedModel(Model):
+    """
+    Args:
+        model (Model): The real model.
+        store: `MemoryStore()` (default) or `DiskStore(path)`.
+        cache_if (callable): Decides from the ModelSettings whether a call may be cached.
+        namespace (str): Part of every key; change it to invalidate old answers (e.g. new prompt version).
+    """
+
+    def __init__(self, model: Model, store: Any = None,
+                 cache_if: Callable[[ModelSettings], bool] = deterministic, namespace: str = "") -> None:
+        self.model = model
+        self.store = store if store is not None else MemoryStore()
+        self.cache_if = cache_if
+        self.namespace = namespace
+        self.model_name = f"{namespace}{getattr(model, 'model', type(model).__name__)}"
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    def _key(self, system_instructions, input, model_settings, tools, output_schema, handoffs,
+             kwargs: Dict[str, Any]) -> Optional[str]:
+        # A previous_response_id points at state on the provider's side, which we cannot hash
+        if kwargs.get("previous_response_id") or not self.cache_if(model_settings):
+            return None
+        return request_key(self.model_name, system_instructions, input, model_settings,
+                           tools, output_schema, handoffs, kwargs.get("prompt"))
+
+    async def _lookup(self, key: Optional[str]) -> Optional[List[Any]]:
+        if key is None:
+            return None
+        entry = await self.store.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.tokens_saved += entry.get("total_tokens", 0)
+        return _output_items.validate_python(entry["output"])
+
+    async def _remember(self, key: Optional[str], output: List[Any], total_tokens: int) -> None:
+        if key is None:
+            return
+        await self.store.set(key, {
+            "output": [item.model_dump(mode="json") for item in output],
+            "total_tokens": total_tokens,
+        })
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, **kwargs: Any) -> ModelResponse:
+        key = self._key(system_instructions, input, model_settings, tools, output_schema, handoffs, kwargs)
+        output = await self._lookup(key)
+        if output is not None:
+            return ModelResponse(output=output, usage=Usage(), response_id=None)
+
+        response = await self.model.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+        await self._remember(key, response.output, response.usage.total_tokens)
+        return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, **kwargs: Any) -> AsyncIterator[Any]:
+        key = self._key(system_instructions, input, model_settings, tools, output_schema, handoffs, kwargs)
+        output = await self._lookup(key)
+        if output is not None:
+            for event in replay_events(self.model_name, output):
+                yield event
+            return
+
+        async for event in self.model.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        ):
+            if isinstance(event, ResponseCompletedEvent):
+                usage = event.response.usage
+                await self._remember(key, event.response.output, usage.total_tokens if usage else 0)
+            yield event
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+        }
@@ -0,0 +1,61 @@
+# A support desk: billing and tech questions are usually obvious from a few words,
+# so only the unclear ones pay for the triage LLM call.
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled
+
+from pre_router import KeywordRouter, LanguageRouter, PreRoutedModel, RuleRouter
+
+load_dotenv()
+set_tracing_disabled(True)
+
+provider = AsyncOpenAI(
+    api_key=os.getenv("GEMINI_API_KEY"),
+    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+)
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=provider)
+
+billing_agent = Agent(name="Billing agent", instructions="You answer billing questions.", model=model)
+tech_agent = Agent(name="Tech agent", instructions="You solve technical problems.", model=model)
+spanish_agent = Agent(name="Spanish agent", instructions="You only speak Spanish.", model=model)
+
+router = PreRoutedModel(model, routers=[
+    RuleRouter([(r"\b(refund|invoice|charged)\b", billing_agent.name)]),
+    KeywordRouter({
+        billing_agent.name: ["bill*", "payment", "price", "subscription", "card"],
+        tech_agent.name: ["crash*", "error", "bug", "install*", "login", "password"],
+    }),
+    LanguageRouter({"es": spanish_agent.name}),
+])
+
+triage_agent = Agent(
+    name="Triage agent",
+    instructions="Hand off to the right agent. Spanish speakers go to the Spanish agent.",
+    handoffs=[billing_agent, tech_agent, spanish_agent],
+    model=router,
+)
+
+questions = [
+    "I was charged twice, I want a refund.",
+    "The app crashes with an error on login.",
+    "¿Dónde está mi pedido?",
+    "Can you help me?",  # unclear: the triage LLM decides
+]
+
+
+async def main():
+    for text in questions:
+        start = time.perf_counter()
+        result = await Runner.run(triage_agent, text)
+        how = router.last_route.reason if router.last_route else "LLM triage"
+        print(f"{time.perf_counter() - start:6.3f}s  {result.last_agent.name:13} ({how})  <- {text}")
+
+    print(router.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,297 @@
+"""
+Pre-Routing for Handoffs
+------------------------
+A triage agent whose only job is to pick a handoff (`triage_Agent` in 26_Items, `triage_agent`
+in 15_Agent_Visualization) spends a full LLM round-trip on a decision that is often obvious
+from the text: "What's the weather in Paris?" goes to the City agent, "¿Qué tiempo hace hoy?"
+goes to the Spanish agent.
+
+`PreRoutedModel` wraps the triage agent's model and asks cheap local routers first:
+
+1. `RuleRouter`: regex rules (microseconds)
+2. `KeywordRouter`: an inverted keyword index, one keyword list per target agent
+3. `LanguageRouter`: a small stopword-profile language-ID model (e.g. Spanish vs English)
+
+On a confident match the model call is skipped and a `transfer_to_<agent>` tool call is
+returned instead, so the SDK runs the **normal handoff**: `is_enabled`, `on_handoff`,
+`input_filter`, tracing and `result.last_agent` all behave as if the LLM had chosen it.
+Otherwise (no match, low confidence, or the target handoff is disabled) the real model is called.
+"""
+
+import re
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputItemAddedEvent,
+    ResponseOutputItemDoneEvent,
+)
+from agents import Handoff, Model, ModelResponse, Usage
+from agents.models.multi_provider import MultiProvider
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class Route:
+    agent_name: str
+    confidence: float
+    reason: str
+
+
+# ─── Routers ─────────────────────────────────────────────────────────────────────
+
+class RuleRouter:
+    """
+    Args:
+        rules (list): (regex, agent name) pairs; the first matching rule wins.
+    """
+
+    name = "rules"
+
+    def __init__(self, rules: Sequence[Tuple[str, str]]) -> None:
+        self.rules = [(re.compile(pattern, re.IGNORECASE), agent_name) for pattern, agent_name in rules]
+
+    def __call__(self, text: str) -> Optional[Route]:
+        for pattern, agent_name in self.rules:
+            if pattern.search(text):
+                return Route(agent_name, 1.0, f"matched rule {pattern.pattern!r}")
+        return None
+
+
+class KeywordRouter:
+    """
+    Inverted index from keyword to target agents. A keyword ending in "*" matches as a
+    prefix ("recurs*" matches "recursion", "recursive").
+
+    Args:
+        keywords (dict): Agent name -> its keywords.
+        min_hits (int): Keywords the best agent must match.
+
+    Confidence is the best agent's share of all keyword hits, so a text matching two
+    agents equally gets 0.5 and falls back to the LLM.
+    """
+
+    name = "keywords"
+
+    def __init__(self, keywords: Dict[str, Iterable[str]], min_hits: int = 1) -> None:
+        self.min_hits = min_hits
+        self._exact: Dict[str, List[str]] = {}
+        self._prefixes: List[Tuple[str, str]] = []
+        for agent_name, words in keywords.items():
+            for word in words:
+                word = word.lower()
+                if word.endswith("*"):
+                    self._prefixes.append((word[:-1], agent_name))
+                else:
+                    self._exact.setdefault(word, []).append(agent_name)
+
+    def __call__(self, text: str) -> Optional[Route]:
+        hits: Counter = Counter()
+        matched: Dict[str, List[str]] = {}
+        for token in _WORD.findall(text.lower()):
+            targets = list(self._exact.get(token, ()))
+            targets += [agent_name for prefix, agent_name in self._prefixes if token.startswith(prefix)]
+            for agent_name in targets:
+                hits[agent_name] += 1
+                matched.setdefault(agent_name, []).append(token)
+        if not hits:
+            return None
+        (agent_name, best), = hits.most_common(1)
+        if best < self.min_hits:
+            return None
+        return Route(agent_name, best / sum(hits.values()), f"keywords {matched[agent_name]}")
+
+
+# Function words are frequent, short and language specific: a few of them identify the language
+LANGUAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "en": {
+        "words": {
+            "the", "is", "are", "was", "what", "how", "why", "when", "where", "who", "which",
+            "in", "of", "and", "to", "you", "your", "it", "this", "that", "do", "does", "can",
+            "please", "my", "i", "with", "for", "on", "at", "hello", "hi", "thanks", "today",
+            "tell", "about", "be", "have", "will", "would", "could", "weather",
+        },
+        "chars": "",
+    },
+    "es": {
+        "words": {
+            "el", "la", "los", "las", "es", "son", "está", "qué", "que", "cómo", "como", "por",
+            "porqué", "cuándo", "dónde", "donde", "quién", "cuál", "en", "de", "del", "al", "y",
+            "un", "una", "para", "con", "mi", "yo", "tú", "usted", "hola", "gracias", "hoy",
+            "dime", "puedes", "hace", "tiempo", "clima", "muy", "pero", "también", "sobre",
+        },
+        "chars": "ñáéíóú¿¡",
+    },
+}
+
+
+class LanguageRouter:
+    """
+    Routes by the language of the text.
+
+    Every function word of a profile counts one vote, every language-specific character
+    (ñ, ¿, accents) half a vote. The winner's share of the votes is the confidence.
+
+    Args:
+        languages (dict): Language code -> agent name, e.g. {"es": "Spanish agent", "en": "English agent"}.
+        min_votes (float): Fewer votes than this (e.g. "ok") never routes.
+        profiles (dict): Language profiles (defaults cover English and Spanish).
+    """
+
+    name = "language"
+
+    def __init__(self, languages: Dict[str, str], min_votes: float = 2.0,
+                 profiles: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.languages = languages
+        self.min_votes = min_votes
+        self.profiles = profiles or {code: LANGUAGE_PROFILES[code] for code in languages}
+
+    def detect(self, text: str) -> Tuple[Optional[str], float, float]:
+        """(language, confidence, votes) for `text`."""
+        text = text.lower()
+        words = _WORD.findall(text)
+        votes: Dict[str, float] = {}
+        for code, profile in self.profiles.items():
+            score = sum(1.0 for w in words if w in profile["words"])
+            score += 0.5 * sum(1 for c in text if c in profile["chars"])
+            votes[code] = score
+        total = sum(votes.values())
+        if total == 0:
+            return None, 0.0, 0.0
+        code = max(votes, key=votes.__getitem__)
+        return code, votes[code] / total, total
+
+    def __call__(self, text: str) -> Optional[Route]:
+        code, confidence, total = self.detect(text)
+        if code is None or total < self.min_votes or code not in self.languages:
+            return None
+        return Route(self.languages[code], confidence, f"language {code} ({total:g} votes)")
+
+
+# ─── The pre-router ──────────────────────────────────────────────────────────────
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "\n".join(p.get("text", "") for p in content or [] if isinstance(p, dict))
+
+
+def last_user_text(input: Any) -> Optional[str]:
+    """The text of the newest input item if it is a user message, else None (e.g. a tool output)."""
+    if isinstance(input, str):
+        return input
+    if not input:
+        return None
+    item = input[-1]
+    item = item if isinstance(item, dict) else item.model_dump()
+    if item.get("role") != "user":
+        return None
+    return _content_text(item.get("content"))
+
+
+class PreRoutedModel(Model):
+    """
+    Args:
+        model: The triage agent's real model (a `Model`, a model name, or None for the default).
+        routers (list): Tried in order; the first confident route wins.
+        min_confidence (float): Routes below this fall back to the LLM.
+    """
+
+    def __init__(self, model: Any, routers: Sequence[Any], min_confidence: float = 0.8) -> None:
+        self.model = model
+        self.routers = list(routers)
+        self.min_confidence = min_confidence
+        self.last_route: Optional[Route] = None
+        self.routed: Counter = Counter()  # by router name
+        self.fallbacks = 0
+        self.seconds = 0.0
+
+    def _model(self) -> Model:
+        # Resolved on first use, so building the agent needs no API key (e.g. for draw_graph)
+        if not isinstance(self.model, Model):
+            self.model = MultiProvider().get_model(self.model)
+        return self.model
+
+    def route(self, input: Any, handoffs: List[Handoff]) -> Optional[Tuple[Handoff, Route]]:
+        """The enabled handoff a local router picks with enough confidence, if any."""
+        text = last_user_text(input)
+        if text is None:  # later turns of the triage agent (after its own tool calls) go to the LLM
+            return None
+        # The SDK only passes enabled handoffs; ones that need LLM-written arguments are skipped
+        targets = {h.agent_name: h for h in handoffs if not h.input_json_schema.get("required")}
+        start = time.perf_counter()
+        try:
+            for router in self.routers:
+                route = router(text)
+                if route is not None and route.confidence >= self.min_confidence and route.agent_name in targets:
+                    self.routed[getattr(router, "name", type(router).__name__)] += 1
+                    self.last_route = route
+                    return targets[route.agent_name], route
+        finally:
+            self.seconds += time.perf_counter() - start
+        self.fallbacks += 1
+        self.last_route = None
+        return None
+
+    @staticmethod
+    def _handoff_call(handoff: Handoff) -> ResponseFunctionToolCall:
+        # No `id`: it stays unset, so the item is sent back without one. The Responses API
+        # rejects any item id it did not issue itself ("Expected an ID that begins with 'fc'")
+        return ResponseFunctionToolCall(
+            arguments="{}",
+            call_id=f"call_preroute_{uuid.uuid4().hex[:16]}",
+            name=handoff.tool_name,
+            type="function_call",
+            status="completed",
+        )
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, **kwargs: Any) -> ModelResponse:
+        picked = self.route(input, handoffs)
+        if picked is not None:
+            return ModelResponse(output=[self._handoff_call(picked[0])], usage=Usage(), response_id=None)
+        return await self._model().get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+
+    async def stream_response(self, system_instructions, input, model_settings, tools,
+                              output_schema, handoffs, tracing, **kwargs: Any) -> AsyncIterator[Any]:
+        picked = self.route(input, handoffs)
+        if picked is None:
+            async for event in self._model().stream_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+            ):
+                yield event
+            return
+
+        call = self._handoff_call(picked[0])
+
+        def response(output: List[Any]) -> Response:
+            return Response(id="__pre_routed__", created_at=time.time(), model="pre-router", object="response",
+                            output=output, tool_choice="auto", tools=[], parallel_tool_calls=False)
+
+        yield ResponseCreatedEvent(response=response([]), sequence_number=0, type="response.created")
+        # No arguments delta: it needs an item id, and the added / done events carry the whole call
+        yield ResponseOutputItemAddedEvent(item=call, output_index=0, sequence_number=1,
+                                           type="response.output_item.added")
+        yield ResponseOutputItemDoneEvent(item=call, output_index=0, sequence_number=2,
+                                          type="response.output_item.done")
+        yield ResponseCompletedEvent(response=response([call]), sequence_number=3, type="response.completed")
+
+    def stats(self) -> Dict[str, Any]:
+        decisions = sum(self.routed.values()) + self.fallbacks
+        return {
+            "routed": dict(self.routed),
+            "fallbacks": self.fallbacks,
+            "llm_calls_saved": sum(self.routed.values()),
+            "hit_rate": round(sum(self.routed.values()) / decisions, 3) if decisions else 0.0,
+            "avg_ms": round(self.seconds / decisions * 1000, 3) if decisions else 0.0,
+        }
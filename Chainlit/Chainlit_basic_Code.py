@@ -2,6 +2,23 @@ from agents import Runner
 from main import orcerstration_agent as agent
 from openai.types.responses import ResponseTextDeltaEvent
 import chainlit as cl
+# The stream adapters live in 08_Agent_Streaming_code: pip install -e ../08_Agent_Streaming_code
+from coalesce import CoalescedStream
+from cancellation import CancellationTracker
+
+# Estimates what cancelled runs saved, from the runs that finished
+tracker = CancellationTracker()
+
+
+def cancel_run(reason: str) -> None:
+    """Stop the run of this chat, if one is streaming: no more tokens, tools or sub-agents."""
+    run = cl.user_session.get("run")
+    cl.user_session.set("run", None)
+    if run is None or run.is_complete:
+        return  # nothing is streaming any more
+    report = run.cancel(reason)
+    with open("history.txt", "a") as file:
+        file.write(f"Cancelled: {report.summary()}\n")
 
 
 @cl.on_chat_start
@@ -20,14 +37,32 @@ async def main(message:cl.Message):
     history.append({'role': 'user', 'content': message.content})
     
     ai_reponse =  Runner.run_streamed(agent, history)
-    async for event in ai_reponse.stream_events():
+    # Cancelled by on_stop / on_chat_end below
+    run = tracker.track(ai_reponse)
+    cl.user_session.set("run", run)
+    # Deltas are sent in chunks (every 30 ms / 256 bytes), not one websocket frame per token
+    async for event in CoalescedStream(ai_reponse).stream_events():
         if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
             raw_txt = event.data.delta
             await msg.stream_token(raw_txt)
 
+    cl.user_session.set("run", None)
+    if run.cancelled:
+        return  # stopped or disconnected: there is no final output to show or remember
 
     msg.content=ai_reponse.final_output
     await msg.update()
     history.append({'role': 'assistant', 'content': ai_reponse.final_output})
     cl.user_session.set("history", history)
-    print("--------------------------------------")
\ No newline at end of file
+    print("--------------------------------------")
+
+
+@cl.on_stop
+async def on_stop():
+    cancel_run("stopped by user")
+
+
+@cl.on_chat_end
+async def on_chat_end():
+    # Tab closed or connection lost: nobody will read the rest of the answer
+    cancel_run("client disconnected")